@@ -1,12 +1,25 @@
+import os
 import re
+import copy
+import io
+import csv
 import json
 import asyncio
-from playwright.async_api import Page, Response
+import hashlib
+import math
+import time
+import uuid
+import orjson
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright   
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import List, Dict, Optional, Tuple
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, quote_plus
+from collections import defaultdict
+from functools import lru_cache
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -210,6 +223,80 @@ class IntelligentPromptParser:
         'search': ['search', 'find', 'look for', 'get', 'fetch', 'retrieve']
     }
     
+    # Precompiled extraction patterns
+    URL_PATTERN = re.compile(
+        r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+    )
+    DOMAIN_PATTERN = re.compile(
+        r'\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\b'
+    )
+    WORD_PATTERN = re.compile(r'\b[a-zA-Z]+\b')
+    KEYWORD_PATTERN = re.compile(r'\b[A-Za-z]{3,}\b')
+    QUOTED_PATTERN = re.compile(r'"([^"]*)"')
+    NUMBER_PATTERN = re.compile(r'\b(\d+)\b')
+    RATING_PATTERN = re.compile(r'rating\s*(?:above|over|more than)\s*(\d+(?:\.\d+)?)')
+    
+    # Price patterns in priority order; single-group patterns give an upper or lower bound
+    PRICE_PATTERNS = [
+        (re.compile(r'under\s*(\d+)'), 'max'),
+        (re.compile(r'below\s*(\d+)'), 'max'),
+        (re.compile(r'less\s*than\s*(\d+)'), 'max'),
+        (re.compile(r'above\s*(\d+)'), 'min'),
+        (re.compile(r'over\s*(\d+)'), 'min'),
+        (re.compile(r'more\s*than\s*(\d+)'), 'min'),
+        (re.compile(r'between\s*(\d+)\s*(?:and|to)\s*(\d+)'), None),
+        (re.compile(r'(\d+)\s*(?:to|-)\s*(\d+)'), None)
+    ]
+    
+    LOCATION_PATTERNS = [
+        re.compile(r'in\s+([A-Za-z\s]+)'), re.compile(r'from\s+([A-Za-z\s]+)'),
+        re.compile(r'at\s+([A-Za-z\s]+)'), re.compile(r'near\s+([A-Za-z\s]+)'),
+        re.compile(r'around\s+([A-Za-z\s]+)')
+    ]
+    
+    # Search result URL per site; the query is URL-encoded and joined with '+'
+    SEARCH_URL_TEMPLATES = {
+        # E-commerce sites
+        'amazon': "https://www.amazon.in/s?k={query}",
+        'flipkart': "https://www.flipkart.com/search?q={query}",
+        'myntra': "https://www.myntra.com/{query}",
+        'ebay': "https://www.ebay.in/sch/i.html?_nkw={query}",
+        'etsy': "https://www.etsy.com/search?q={query}",
+        'shopify': "https://www.shopify.com/search?q={query}",
+        
+        # Job sites
+        'naukri': "https://www.naukri.com/jobs-in-india?k={query}",
+        'linkedin': "https://www.linkedin.com/jobs/search/?keywords={query}",
+        'indeed': "https://www.indeed.co.in/jobs?q={query}",
+        'monster': "https://www.monsterindia.com/search/{query}-jobs",
+        'glassdoor': "https://www.glassdoor.co.in/Job/jobs.htm?sc.keyword={query}",
+        
+        # News sites
+        'times': "https://timesofindia.indiatimes.com/topic/{query}",
+        'hindu': "https://www.thehindu.com/search/?q={query}",
+        'ndtv': "https://www.ndtv.com/search?searchtext={query}",
+        'cnn': "https://www.cnn.com/search?q={query}",
+        'bbc': "https://www.bbc.com/search?q={query}",
+        
+        # Real estate
+        'magicbricks': "https://www.magicbricks.com/property-for-sale/residential-real-estate?keyword={query}",
+        'housing': "https://housing.com/in/search?q={query}",
+        'zillow': "https://www.zillow.com/homes/{query}_rb/",
+        
+        # Travel
+        'makemytrip': "https://www.makemytrip.com/search?q={query}",
+        'booking': "https://www.booking.com/searchresults.html?ss={query}",
+        'airbnb': "https://www.airbnb.com/s/{query}",
+        
+        # Education
+        'coursera': "https://www.coursera.org/search?query={query}",
+        'udemy': "https://www.udemy.com/courses/search/?q={query}",
+        'edx': "https://www.edx.org/search?q={query}",
+        
+        # Default fallback
+        'default': "https://www.google.com/search?q={query}"
+    }
+    
     @classmethod
     def parse_comprehensive_prompt(cls, prompt: str) -> Dict:
         """
@@ -260,20 +347,27 @@ class IntelligentPromptParser:
             'confidence_score': cls._calculate_overall_confidence(target_websites)
         }
     
+    @classmethod
+    def parse_prompt_cached(cls, prompt: str) -> Dict:
+        """
+        Cached variant of parse_comprehensive_prompt for repeated prompts
+        Returns a deep copy so callers can mutate the result freely
+        """
+        return copy.deepcopy(cls._parse_cached(prompt))
+    
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _parse_cached(cls, prompt: str) -> Dict:
+        """Memoized parse keyed by the prompt text"""
+        return cls.parse_comprehensive_prompt(prompt)
+    
     @classmethod
     def _extract_urls(cls, prompt: str) -> List[str]:
         """Extract all URLs from prompt"""
-        # Enhanced URL pattern
-        url_pattern = re.compile(
-            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        )
-        urls = url_pattern.findall(prompt)
+        urls = cls.URL_PATTERN.findall(prompt)
         
         # Extract domain-like patterns
-        domain_pattern = re.compile(
-            r'\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\b'
-        )
-        potential_domains = domain_pattern.findall(prompt.lower())
+        potential_domains = cls.DOMAIN_PATTERN.findall(prompt.lower())
         
         # Validate and add http to domains
         for domain in potential_domains:
@@ -335,52 +429,10 @@ class IntelligentPromptParser:
     def _construct_search_url(cls, site_name: str, prompt: str, content_type: ContentType) -> Optional[str]:
         """Construct intelligent search URLs based on site and content type"""
         search_terms = cls._extract_search_terms(prompt)
-        search_query = "+".join(search_terms[:5])
-        encoded_query = search_query.replace(" ", "+")
-        
-        url_templates = {
-            # E-commerce sites
-            'amazon': f"https://www.amazon.in/s?k={encoded_query}",
-            'flipkart': f"https://www.flipkart.com/search?q={encoded_query}",
-            'myntra': f"https://www.myntra.com/{encoded_query}",
-            'ebay': f"https://www.ebay.in/sch/i.html?_nkw={encoded_query}",
-            'etsy': f"https://www.etsy.com/search?q={encoded_query}",
-            'shopify': f"https://www.shopify.com/search?q={encoded_query}",
-            
-            # Job sites
-            'naukri': f"https://www.naukri.com/jobs-in-india?k={encoded_query}",
-            'linkedin': f"https://www.linkedin.com/jobs/search/?keywords={encoded_query}",
-            'indeed': f"https://www.indeed.co.in/jobs?q={encoded_query}",
-            'monster': f"https://www.monsterindia.com/search/{encoded_query}-jobs",
-            'glassdoor': f"https://www.glassdoor.co.in/Job/jobs.htm?sc.keyword={encoded_query}",
-            
-            # News sites
-            'times': f"https://timesofindia.indiatimes.com/topic/{encoded_query}",
-            'hindu': f"https://www.thehindu.com/search/?q={encoded_query}",
-            'ndtv': f"https://www.ndtv.com/search?searchtext={encoded_query}",
-            'cnn': f"https://www.cnn.com/search?q={encoded_query}",
-            'bbc': f"https://www.bbc.com/search?q={encoded_query}",
-            
-            # Real estate
-            'magicbricks': f"https://www.magicbricks.com/property-for-sale/residential-real-estate?keyword={encoded_query}",
-            'housing': f"https://housing.com/in/search?q={encoded_query}",
-            'zillow': f"https://www.zillow.com/homes/{encoded_query}_rb/",
-            
-            # Travel
-            'makemytrip': f"https://www.makemytrip.com/search?q={encoded_query}",
-            'booking': f"https://www.booking.com/searchresults.html?ss={encoded_query}",
-            'airbnb': f"https://www.airbnb.com/s/{encoded_query}",
-            
-            # Education
-            'coursera': f"https://www.coursera.org/search?query={encoded_query}",
-            'udemy': f"https://www.udemy.com/courses/search/?q={encoded_query}",
-            'edx': f"https://www.edx.org/search?q={encoded_query}",
-            
-            # Default fallback
-            'default': f"https://www.google.com/search?q={encoded_query}"
-        }
+        encoded_query = quote_plus(" ".join(search_terms[:5]))
         
-        return url_templates.get(site_name, url_templates['default'])
+        template = cls.SEARCH_URL_TEMPLATES.get(site_name, cls.SEARCH_URL_TEMPLATES['default'])
+        return template.format(query=encoded_query)
     
     @classmethod
     def _extract_search_terms(cls, prompt: str) -> List[str]:
@@ -398,14 +450,14 @@ class IntelligentPromptParser:
         }
         
         # Extract words and phrases
-        words = re.findall(r'\b[a-zA-Z]+\b', prompt.lower())
+        words = cls.WORD_PATTERN.findall(prompt.lower())
         meaningful_words = [
             word for word in words 
             if word not in stop_words and len(word) > 2
         ]
         
         # Extract quoted phrases
-        quoted_phrases = re.findall(r'"([^"]*)"', prompt)
+        quoted_phrases = cls.QUOTED_PATTERN.findall(prompt)
         meaningful_words.extend(quoted_phrases)
         
         return meaningful_words[:10]  # Limit to 10 terms
@@ -415,6 +467,7 @@ class IntelligentPromptParser:
         """Infer relevant websites based on content type"""
         websites = []
         search_terms = cls._extract_search_terms(prompt)
+        search_query = quote_plus(" ".join(search_terms[:3]))
         
         if content_type == ContentType.PRODUCTS:
             # Major e-commerce sites
@@ -426,7 +479,6 @@ class IntelligentPromptParser:
             ]
             
             for site_name, base_url, site_type in ecommerce_sites:
-                search_query = "+".join(search_terms[:3])
                 websites.append(WebsiteInfo(
                     url=f"{base_url}{search_query}",
                     domain=site_name,
@@ -446,7 +498,6 @@ class IntelligentPromptParser:
             ]
             
             for site_name, base_url, site_type in job_sites:
-                search_query = "+".join(search_terms[:3])
                 websites.append(WebsiteInfo(
                     url=f"{base_url}{search_query}",
                     domain=site_name,
@@ -552,7 +603,7 @@ class IntelligentPromptParser:
             requirements['include_links'] = True
         
         # Extract max items if specified
-        numbers = re.findall(r'\b(\d+)\b', prompt)
+        numbers = cls.NUMBER_PATTERN.findall(prompt)
         if numbers:
             max_items = int(numbers[-1])  # Take the last number mentioned
             if 1 <= max_items <= 1000:
@@ -580,44 +631,29 @@ class IntelligentPromptParser:
         }
         
         # Price range extraction
-        price_patterns = [
-            r'under\s*(\d+)', r'below\s*(\d+)', r'less\s*than\s*(\d+)',
-            r'above\s*(\d+)', r'over\s*(\d+)', r'more\s*than\s*(\d+)',
-            r'between\s*(\d+)\s*(?:and|to)\s*(\d+)',
-            r'(\d+)\s*(?:to|-)\s*(\d+)'
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, prompt)
+        for pattern, bound in cls.PRICE_PATTERNS:
+            match = pattern.search(prompt)
             if match:
                 groups = match.groups()
                 if len(groups) == 1:
-                    if 'under' in pattern or 'below' in pattern or 'less' in pattern:
-                        filters['price_range'] = {'max': int(groups[0])}
-                    else:
-                        filters['price_range'] = {'min': int(groups[0])}
+                    filters['price_range'] = {bound: int(groups[0])}
                 elif len(groups) == 2:
                     filters['price_range'] = {'min': int(groups[0]), 'max': int(groups[1])}
                 break
         
         # Rating extraction
-        rating_match = re.search(r'rating\s*(?:above|over|more than)\s*(\d+(?:\.\d+)?)', prompt)
+        rating_match = cls.RATING_PATTERN.search(prompt)
         if rating_match:
             filters['rating_min'] = float(rating_match.group(1))
         
         # Location extraction
-        location_patterns = [
-            r'in\s+([A-Za-z\s]+)', r'from\s+([A-Za-z\s]+)', r'at\s+([A-Za-z\s]+)',
-            r'near\s+([A-Za-z\s]+)', r'around\s+([A-Za-z\s]+)'
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, prompt)
+        for pattern in cls.LOCATION_PATTERNS:
+            matches = pattern.findall(prompt)
             filters['location'].extend(matches)
         
         # Keyword extraction (excluding common stop words)
         exclude_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        words = re.findall(r'\b[A-Za-z]{3,}\b', prompt.lower())
+        words = cls.KEYWORD_PATTERN.findall(prompt.lower())
         filters['keywords'] = [word for word in words if word not in exclude_words][:10]
         
         return filters
@@ -650,12 +686,306 @@ class IntelligentPromptParser:
 class StealthScraper:
     """Advanced stealth scraper with anti-bot detection"""
     
+    # Images, stylesheets, fonts and media blocked for performance, matched on
+    # extension with or without a query string (setBlockedURLs globs the whole URL)
+    BLOCKED_EXTENSIONS = [
+        'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp',
+        'css', 'woff', 'woff2', 'ttf', 'otf', 'eot',
+        'mp4', 'webm', 'ogg', 'ogv', 'mov', 'm4v', 'mp3', 'wav', 'm4a', 'flac'
+    ]
+    BLOCKED_URL_PATTERNS = [
+        pattern
+        for extension in BLOCKED_EXTENSIONS
+        for pattern in (f'*.{extension}', f'*.{extension}?*')
+    ]
+    
+    # Harvests text-only content for the general extractor in one evaluate call
+    GENERAL_CONTENT_SCRIPT = """
+        (opts) => {
+            let els = [];
+            for (const selector of opts.selectors) {
+                els = Array.from(document.querySelectorAll(selector));
+                if (els.length) break;
+            }
+            // Fallback to paragraphs and headers
+            if (!els.length) {
+                els = Array.from(document.querySelectorAll(opts.fallback));
+            }
+            return els.slice(0, opts.max).map(el => {
+                const isHeading = /^h[1-6]$/i.test(el.tagName);
+                const text = el.innerText || '';
+                const titleEl = isHeading ? el : el.querySelector('h1, h2, h3, h4, h5, h6, [class*="title"]');
+                const item = {
+                    title: titleEl ? titleEl.innerText : (text.length > 100 ? text.slice(0, 100) + '...' : text),
+                    type: isHeading ? 'heading' : 'content',
+                    content: text
+                };
+                if (opts.includeLinks) {
+                    const link = el.querySelector('a');
+                    if (link) item.url = link.getAttribute('href');
+                }
+                return item;
+            }).filter(item => item.content && item.content.trim().length > 10);
+        }
+    """
+    
+    # Finds item containers (falling back to the largest group of elements
+    # sharing a first class name) and reads every schema field in one evaluate call
+    SCHEMA_EXTRACT_SCRIPT = """
+        (opts) => {
+            const textOf = (el, selectors) => {
+                for (const selector of selectors) {
+                    const target = el.querySelector(selector);
+                    const text = target ? (target.innerText || '').trim() : '';
+                    if (text) return text;
+                }
+                return '';
+            };
+            
+            let els = [];
+            for (const selector of opts.containers) {
+                els = Array.from(document.querySelectorAll(selector));
+                if (els.length) {
+                    els = els.slice(0, opts.max);
+                    break;
+                }
+            }
+            
+            // Fallback: find any repeated structure
+            if (!els.length) {
+                const groups = new Map();
+                for (const el of document.querySelectorAll('[class], [id]')) {
+                    const first = (el.getAttribute('class') || '').trim().split(/\\s+/)[0];
+                    if (!first) continue;
+                    if (!groups.has(first)) groups.set(first, []);
+                    groups.get(first).push(el);
+                }
+                for (const group of groups.values()) {
+                    if (group.length > els.length && group.length >= 3
+                            && (group[0].innerText || '').trim().length > 20) {
+                        els = group;
+                    }
+                }
+                els = els.slice(0, 50);
+            }
+            
+            const items = [];
+            for (const el of els) {
+                const item = {};
+                for (const [field, selectors] of Object.entries(opts.fields)) {
+                    item[field] = textOf(el, selectors);
+                }
+                if (opts.imageField) {
+                    const img = el.querySelector('img');
+                    if (img) item[opts.imageField] = img.getAttribute('src');
+                }
+                if (opts.linkField) {
+                    const link = el.querySelector('a');
+                    if (link) item[opts.linkField] = link.getAttribute('href');
+                }
+                // Only keep items with meaningful data
+                if (opts.required.some(field => item[field])) items.push(item);
+            }
+            return items;
+        }
+    """
+    
+    # Container selectors that signal dynamic content has rendered
+    CONTENT_WAIT_SELECTORS = {
+        ContentType.PRODUCTS: '[data-testid*="product"], .product-item, .product-card, [class*="product"]',
+        ContentType.JOBS: '[class*="job"], .job-card, .job-item, [data-testid*="job"]',
+        ContentType.NEWS: 'article, [class*="article"], [class*="news"], [class*="story"]',
+        ContentType.REAL_ESTATE: '[class*="property"], [class*="listing"], .property-card',
+        ContentType.GENERAL: 'article, main, p'
+    }
+    
+    # Per-content-type container and field selectors
+    EXTRACTION_SCHEMAS = {
+        ContentType.PRODUCTS: {
+            'label': 'product',
+            'containers': [
+                '[data-testid*="product"]',
+                '.product-item', '.product-card', '.product-container',
+                '[class*="product"]', '[id*="product"]',
+                '.item', '.listing-item', '.search-result-item',
+                '.grid-item', '.tile', '.card'
+            ],
+            'fields': {
+                'title': [
+                    'h1', 'h2', 'h3', '[class*="title"]', '[class*="name"]',
+                    'a[title]', '.product-title', '.item-title', '[data-testid*="title"]'
+                ],
+                'price': [
+                    '[class*="price"]', '[class*="cost"]', '[class*="amount"]',
+                    '.money', '.currency', '[data-testid*="price"]', '.price-current'
+                ],
+                'rating': [
+                    '[class*="rating"]', '[class*="star"]', '[class*="review"]',
+                    '.rating-value', '.star-rating', '[data-testid*="rating"]'
+                ],
+                'description': [
+                    '[class*="description"]', '[class*="summary"]', 'p',
+                    '.product-desc', '.item-desc', '[data-testid*="desc"]'
+                ],
+                'availability': [
+                    '[class*="stock"]', '[class*="available"]', '[class*="delivery"]',
+                    '.availability', '.in-stock', '.out-of-stock'
+                ]
+            },
+            'required': ('title', 'price'),
+            'image_field': 'image_url',
+            'link_field': 'product_url'
+        },
+        ContentType.JOBS: {
+            'label': 'job',
+            'containers': [
+                '[class*="job"]', '[class*="vacancy"]', '[class*="opening"]',
+                '.listing-item', '.search-result', '.job-card', '.job-item',
+                '[data-testid*="job"]', '.position', '.role'
+            ],
+            'fields': {
+                'title': [
+                    'h1', 'h2', 'h3', '[class*="title"]', '[class*="role"]',
+                    '.job-title', '.position-title', 'a[title]'
+                ],
+                'company': [
+                    '[class*="company"]', '[class*="employer"]', '[class*="organization"]',
+                    '.company-name', '.employer-name', '[data-testid*="company"]'
+                ],
+                'location': [
+                    '[class*="location"]', '[class*="city"]', '[class*="place"]',
+                    '.job-location', '.location-name', '[data-testid*="location"]'
+                ],
+                'salary': [
+                    '[class*="salary"]', '[class*="pay"]', '[class*="wage"]',
+                    '.compensation', '.salary-range', '[data-testid*="salary"]'
+                ],
+                'experience': [
+                    '[class*="experience"]', '[class*="exp"]', '[class*="year"]',
+                    '.experience-required', '.years-exp'
+                ],
+                'skills': [
+                    '[class*="skill"]', '[class*="tech"]', '[class*="requirement"]',
+                    '.skills-required', '.technologies'
+                ]
+            },
+            'required': ('title', 'company')
+        },
+        ContentType.NEWS: {
+            'label': 'article',
+            'containers': [
+                'article', '[class*="article"]', '[class*="news"]', '[class*="story"]',
+                '.post', '.entry', '.content-item', '[data-testid*="article"]',
+                '.headline-item', '.news-item'
+            ],
+            'fields': {
+                'headline': [
+                    'h1', 'h2', 'h3', '[class*="headline"]', '[class*="title"]',
+                    '.article-title', '.news-title', 'a[title]'
+                ],
+                'summary': [
+                    '[class*="summary"]', '[class*="excerpt"]', '[class*="description"]',
+                    'p', '.lead', '.intro', '.article-summary'
+                ],
+                'author': [
+                    '[class*="author"]', '[class*="byline"]', '[class*="writer"]',
+                    '.by-author', '.article-author', '[data-testid*="author"]'
+                ],
+                'published_date': [
+                    '[class*="date"]', '[class*="time"]', '[class*="published"]',
+                    'time', '.publish-date', '.article-date', '[datetime]'
+                ],
+                'category': [
+                    '[class*="category"]', '[class*="section"]', '[class*="tag"]',
+                    '.news-category', '.article-category', '.section-name'
+                ]
+            },
+            'required': ('headline',)
+        },
+        ContentType.REAL_ESTATE: {
+            'label': 'property',
+            'containers': [
+                '[class*="property"]', '[class*="listing"]', '[class*="real-estate"]',
+                '.property-card', '.listing-item', '.property-item', '.house-card',
+                '[data-testid*="property"]', '.property-result'
+            ],
+            'fields': {
+                'title': [
+                    'h1', 'h2', 'h3', '[class*="title"]', '[class*="name"]',
+                    '.property-title', '.listing-title', 'a[title]'
+                ],
+                'price': [
+                    '[class*="price"]', '[class*="cost"]', '[class*="rent"]',
+                    '.property-price', '.listing-price', '[data-testid*="price"]'
+                ],
+                'location': [
+                    '[class*="location"]', '[class*="address"]', '[class*="area"]',
+                    '.property-location', '.listing-location', '.address'
+                ],
+                'area': [
+                    '[class*="area"]', '[class*="size"]', '[class*="sqft"]',
+                    '.property-area', '.carpet-area', '.built-area'
+                ],
+                'bedrooms': [
+                    '[class*="bedroom"]', '[class*="bhk"]', '[class*="bed"]',
+                    '.bedrooms', '.bhk-info', '[data-testid*="bedroom"]'
+                ],
+                'bathrooms': [
+                    '[class*="bathroom"]', '[class*="bath"]', '[class*="toilet"]',
+                    '.bathrooms', '.bath-info', '[data-testid*="bathroom"]'
+                ]
+            },
+            'required': ('title', 'price')
+        },
+        ContentType.GENERAL: {
+            'label': 'content',
+            'containers': [
+                'article', '.post', '.entry', '.content-item', '.card',
+                '.item', '.listing', '.result', '[class*="item"]'
+            ],
+            'fallback': 'p, h1, h2, h3, h4, h5, h6'
+        }
+    }
+    
+    # Chromium launch flags for the shared browser
+    BROWSER_ARGS = [
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-accelerated-2d-canvas',
+        '--no-first-run',
+        '--no-zygote',
+        '--disable-gpu',
+        '--disable-web-security',
+        '--disable-features=VizDisplayCompositor',
+        '--disable-background-timer-throttling',
+        '--disable-renderer-backgrounding',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-ipc-flooding-protection',
+        # Skip image decoding for images that slip past the URL blocklist
+        '--blink-settings=imagesEnabled=false'
+    ]
+    
+    # One Playwright driver and Chromium per process; scrapes get their own context
+    _shared_playwright = None
+    _shared_browser = None
+    _browser_lock: Optional[asyncio.Lock] = None
+    
     def __init__(self):
         self.browser = None
         self.context = None
         self.max_retries = 3
         self.retry_delay = 2
         
+        # Content type -> (extractor, schema) dispatch table
+        self._extractors = {
+            content_type: (self._extract_with_schema, schema)
+            for content_type, schema in self.EXTRACTION_SCHEMAS.items()
+        }
+        self._extractors[ContentType.GENERAL] = (
+            self._extract_general_content, self.EXTRACTION_SCHEMAS[ContentType.GENERAL]
+        )
+        
     async def __aenter__(self):
         await self.initialize()
         return self
@@ -663,31 +993,38 @@ class StealthScraper:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.cleanup()
     
+    @classmethod
+    async def get_browser(cls):
+        """Return the process-wide Chromium instance, launching it on first use"""
+        if cls._browser_lock is None:
+            cls._browser_lock = asyncio.Lock()
+        
+        async with cls._browser_lock:
+            if cls._shared_browser is None or not cls._shared_browser.is_connected():
+                if cls._shared_playwright is None:
+                    cls._shared_playwright = await async_playwright().start()
+                
+                # Advanced browser configuration for stealth
+                cls._shared_browser = await cls._shared_playwright.chromium.launch(
+                    headless=True,
+                    args=cls.BROWSER_ARGS
+                )
+        
+        return cls._shared_browser
+    
+    @classmethod
+    async def shutdown_browser(cls):
+        """Close the shared browser and stop Playwright"""
+        if cls._shared_browser:
+            await cls._shared_browser.close()
+            cls._shared_browser = None
+        if cls._shared_playwright:
+            await cls._shared_playwright.stop()
+            cls._shared_playwright = None
+    
     async def initialize(self):
-        """Initialize browser with stealth configuration"""
-        from playwright.async_api import async_playwright
-        
-        self.playwright = await async_playwright().start()
-        
-        # Advanced browser configuration for stealth
-        self.browser = await self.playwright.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-accelerated-2d-canvas',
-                '--no-first-run',
-                '--no-zygote',
-                '--disable-gpu',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-background-timer-throttling',
-                '--disable-renderer-backgrounding',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-ipc-flooding-protection'
-            ]
-        )
+        """Open an isolated stealth context on the shared browser"""
+        self.browser = await self.get_browser()
         
         # Create stealth context
         self.context = await self.browser.new_context(
@@ -702,9 +1039,6 @@ class StealthScraper:
             }
         )
         
-        # Block unnecessary resources
-        await self.context.route('**/*', self._handle_route)
-        
         # Add stealth scripts
         await self.context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {
@@ -727,500 +1061,304 @@ class StealthScraper:
             );
         """)
     
-    async def _handle_route(self, route):
-        """Handle route blocking for performance"""
-        resource_type = route.request.resource_type
-        
-        # Block unnecessary resources
-        if resource_type in ['image', 'stylesheet', 'font', 'media']:
-            await route.abort()
-        else:
-            await route.continue_()
+    async def _block_resources(self, page):
+        """Block unnecessary resources browser-side via CDP"""
+        client = await self.context.new_cdp_session(page)
+        await client.send("Network.enable")
+        await client.send("Network.setBlockedURLs", {"urls": self.BLOCKED_URL_PATTERNS})
+    
+    async def _wait_for_content(self, page, content_type: ContentType):
+        """Wait until content containers render, falling back to network idle"""
+        wait_hint = self.CONTENT_WAIT_SELECTORS.get(content_type, self.CONTENT_WAIT_SELECTORS[ContentType.GENERAL])
+        try:
+            await page.wait_for_selector(wait_hint, timeout=5000, state='attached')
+        except PlaywrightTimeoutError:
+            try:
+                await page.wait_for_load_state('networkidle', timeout=2000)
+            except PlaywrightTimeoutError:
+                logger.debug("No content signal within timeout on %s", page.url)
     
     async def cleanup(self):
-        """Clean up browser resources"""
+        """Close this scraper's context; the shared browser stays up"""
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if hasattr(self, 'playwright'):
-            await self.playwright.stop()
+            self.context = None
     
     async def scrape_website(self, website_info: WebsiteInfo, extraction_requirements: Dict) -> List[Dict]:
         """Scrape a single website with intelligent content extraction"""
         results = []
+        # One page serves every attempt; it is only replaced if it crashed
+        page = await self._open_page()
         
-        for attempt in range(self.max_retries):
-            try:
-                page = await self.context.new_page()
-                
-                # Navigate with timeout
-                await page.goto(website_info.url, wait_until='domcontentloaded', timeout=30000)
-                
-                # Wait for dynamic content
-                if website_info.requires_js:
-                    await page.wait_for_timeout(3000)
-                
-                # Extract data based on content type
-                if website_info.content_type == ContentType.PRODUCTS:
-                    results = await self._extract_products(page, extraction_requirements)
-                elif website_info.content_type == ContentType.JOBS:
-                    results = await self._extract_jobs(page, extraction_requirements)
-                elif website_info.content_type == ContentType.NEWS:
-                    results = await self._extract_news(page, extraction_requirements)
-                elif website_info.content_type == ContentType.REAL_ESTATE:
-                    results = await self._extract_real_estate(page, extraction_requirements)
-                else:
-                    results = await self._extract_general_content(page, extraction_requirements)
-                
-                # Add metadata to each result
-                for result in results:
-                    result.update({
-                        'source_url': website_info.url,
-                        'source_domain': website_info.domain,
-                        'scraped_at': datetime.now().isoformat(),
-                        'confidence_score': website_info.confidence_score
-                    })
-                
-                await page.close()
-                
-                if results:
-                    logger.info(f"Successfully scraped {len(results)} items from {website_info.domain}")
-                    break
-                else:
-                    logger.warning(f"No data extracted from {website_info.domain} on attempt {attempt + 1}")
+        try:
+            for attempt in range(self.max_retries):
+                try:
+                    if page.is_closed():
+                        page = await self._open_page()
                     
-            except Exception as e:
-                logger.error(f"Error scraping {website_info.url} (attempt {attempt + 1}): {str(e)}")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (2 ** attempt))
-                else:
-                    logger.error(f"Failed to scrape {website_info.url} after {self.max_retries} attempts")
-        
-        return results
-    
-    async def _extract_products(self, page, requirements: Dict) -> List[Dict]:
-        """Extract product information from e-commerce sites"""
-        products = []
-        
-        # Common product selectors for different sites
-        product_selectors = [
-            '[data-testid*="product"]',
-            '.product-item', '.product-card', '.product-container',
-            '[class*="product"]', '[id*="product"]',
-            '.item', '.listing-item', '.search-result-item',
-            '.grid-item', '.tile', '.card'
-        ]
-        
-        # Find product containers
-        product_elements = []
-        for selector in product_selectors:
-            elements = await page.query_selector_all(selector)
-            if elements:
-                product_elements = elements[:requirements.get('max_items', 50)]
-                break
-        
-        if not product_elements:
-            # Fallback: find any repeated structure
-            product_elements = await self._find_repeated_elements(page)
-        
-        for element in product_elements:
-            try:
-                product = {}
-                
-                # Extract title
-                title_selectors = [
-                    'h1', 'h2', 'h3', '[class*="title"]', '[class*="name"]',
-                    'a[title]', '.product-title', '.item-title', '[data-testid*="title"]'
-                ]
-                product['title'] = await self._extract_text_by_selectors(element, title_selectors)
-                
-                # Extract price
-                price_selectors = [
-                    '[class*="price"]', '[class*="cost"]', '[class*="amount"]',
-                    '.money', '.currency', '[data-testid*="price"]', '.price-current'
-                ]
-                product['price'] = await self._extract_text_by_selectors(element, price_selectors)
-                
-                # Extract rating
-                rating_selectors = [
-                    '[class*="rating"]', '[class*="star"]', '[class*="review"]',
-                    '.rating-value', '.star-rating', '[data-testid*="rating"]'
-                ]
-                product['rating'] = await self._extract_text_by_selectors(element, rating_selectors)
-                
-                # Extract description
-                desc_selectors = [
-                    '[class*="description"]', '[class*="summary"]', 'p',
-                    '.product-desc', '.item-desc', '[data-testid*="desc"]'
-                ]
-                product['description'] = await self._extract_text_by_selectors(element, desc_selectors)
-                
-                # Extract availability
-                avail_selectors = [
-                    '[class*="stock"]', '[class*="available"]', '[class*="delivery"]',
-                    '.availability', '.in-stock', '.out-of-stock'
-                ]
-                product['availability'] = await self._extract_text_by_selectors(element, avail_selectors)
-                
-                # Extract image if requested
-                if requirements.get('include_images'):
-                    img_element = await element.query_selector('img')
-                    if img_element:
-                        product['image_url'] = await img_element.get_attribute('src')
-                
-                # Extract link if requested
-                if requirements.get('include_links'):
-                    link_element = await element.query_selector('a')
-                    if link_element:
-                        product['product_url'] = await link_element.get_attribute('href')
-                
-                # Only add if we have meaningful data
-                if product.get('title') or product.get('price'):
-                    products.append(product)
+                    # Navigate with timeout
+                    await page.goto(website_info.url, wait_until='domcontentloaded', timeout=30000)
                     
-            except Exception as e:
-                logger.debug(f"Error extracting product: {str(e)}")
-                continue
-        
-        return products
-    
-    async def _extract_jobs(self, page, requirements: Dict) -> List[Dict]:
-        """Extract job listings"""
-        jobs = []
-        
-        job_selectors = [
-            '[class*="job"]', '[class*="vacancy"]', '[class*="opening"]',
-            '.listing-item', '.search-result', '.job-card', '.job-item',
-            '[data-testid*="job"]', '.position', '.role'
-        ]
-        
-        job_elements = []
-        for selector in job_selectors:
-            elements = await page.query_selector_all(selector)
-            if elements:
-                job_elements = elements[:requirements.get('max_items', 50)]
-                break
-        
-        if not job_elements:
-            job_elements = await self._find_repeated_elements(page)
-        
-        for element in job_elements:
-            try:
-                job = {}
-                
-                # Job title
-                title_selectors = [
-                    'h1', 'h2', 'h3', '[class*="title"]', '[class*="role"]',
-                    '.job-title', '.position-title', 'a[title]'
-                ]
-                job['title'] = await self._extract_text_by_selectors(element, title_selectors)
-                
-                # Company
-                company_selectors = [
-                    '[class*="company"]', '[class*="employer"]', '[class*="organization"]',
-                    '.company-name', '.employer-name', '[data-testid*="company"]'
-                ]
-                job['company'] = await self._extract_text_by_selectors(element, company_selectors)
-                
-                # Location
-                location_selectors = [
-                    '[class*="location"]', '[class*="city"]', '[class*="place"]',
-                    '.job-location', '.location-name', '[data-testid*="location"]'
-                ]
-                job['location'] = await self._extract_text_by_selectors(element, location_selectors)
-                
-                # Salary
-                salary_selectors = [
-                    '[class*="salary"]', '[class*="pay"]', '[class*="wage"]',
-                    '.compensation', '.salary-range', '[data-testid*="salary"]'
-                ]
-                job['salary'] = await self._extract_text_by_selectors(element, salary_selectors)
-                
-                # Experience
-                exp_selectors = [
-                    '[class*="experience"]', '[class*="exp"]', '[class*="year"]',
-                    '.experience-required', '.years-exp'
-                ]
-                job['experience'] = await self._extract_text_by_selectors(element, exp_selectors)
-                
-                # Skills
-                skill_selectors = [
-                    '[class*="skill"]', '[class*="tech"]', '[class*="requirement"]',
-                    '.skills-required', '.technologies'
-                ]
-                job['skills'] = await self._extract_text_by_selectors(element, skill_selectors)
-                
-                if job.get('title') or job.get('company'):
-                    jobs.append(job)
+                    # Wait for dynamic content
+                    if website_info.requires_js:
+                        await self._wait_for_content(page, website_info.content_type)
                     
-            except Exception as e:
-                logger.debug(f"Error extracting job: {str(e)}")
-                continue
-        
-        return jobs
-    
-    async def _extract_news(self, page, requirements: Dict) -> List[Dict]:
-        """Extract news articles"""
-        articles = []
-        
-        article_selectors = [
-            'article', '[class*="article"]', '[class*="news"]', '[class*="story"]',
-            '.post', '.entry', '.content-item', '[data-testid*="article"]',
-            '.headline-item', '.news-item'
-        ]
-        
-        article_elements = []
-        for selector in article_selectors:
-            elements = await page.query_selector_all(selector)
-            if elements:
-                article_elements = elements[:requirements.get('max_items', 50)]
-                break
-        
-        if not article_elements:
-            article_elements = await self._find_repeated_elements(page)
-        
-        for element in article_elements:
-            try:
-                article = {}
-                
-                # Headline
-                headline_selectors = [
-                    'h1', 'h2', 'h3', '[class*="headline"]', '[class*="title"]',
-                    '.article-title', '.news-title', 'a[title]'
-                ]
-                article['headline'] = await self._extract_text_by_selectors(element, headline_selectors)
-                
-                # Summary
-                summary_selectors = [
-                    '[class*="summary"]', '[class*="excerpt"]', '[class*="description"]',
-                    'p', '.lead', '.intro', '.article-summary'
-                ]
-                article['summary'] = await self._extract_text_by_selectors(element, summary_selectors)
-                
-                # Author
-                author_selectors = [
-                    '[class*="author"]', '[class*="byline"]', '[class*="writer"]',
-                    '.by-author', '.article-author', '[data-testid*="author"]'
-                ]
-                article['author'] = await self._extract_text_by_selectors(element, author_selectors)
-                
-                # Published date
-                date_selectors = [
-                    '[class*="date"]', '[class*="time"]', '[class*="published"]',
-                    'time', '.publish-date', '.article-date', '[datetime]'
-                ]
-                article['published_date'] = await self._extract_text_by_selectors(element, date_selectors)
-                
-                # Category
-                category_selectors = [
-                    '[class*="category"]', '[class*="section"]', '[class*="tag"]',
-                    '.news-category', '.article-category', '.section-name'
-                ]
-                article['category'] = await self._extract_text_by_selectors(element, category_selectors)
-                
-                if article.get('headline'):
-                    articles.append(article)
+                    # Extract data based on content type
+                    extractor, schema = self._extractors.get(
+                        website_info.content_type, self._extractors[ContentType.GENERAL]
+                    )
+                    results = await extractor(page, extraction_requirements, schema)
                     
-            except Exception as e:
-                logger.debug(f"Error extracting article: {str(e)}")
-                continue
-        
-        return articles
-    
-    async def _extract_real_estate(self, page, requirements: Dict) -> List[Dict]:
-        """Extract real estate listings"""
-        properties = []
-        
-        property_selectors = [
-            '[class*="property"]', '[class*="listing"]', '[class*="real-estate"]',
-            '.property-card', '.listing-item', '.property-item', '.house-card',
-            '[data-testid*="property"]', '.property-result'
-        ]
-        
-        property_elements = []
-        for selector in property_selectors:
-            elements = await page.query_selector_all(selector)
-            if elements:
-                property_elements = elements[:requirements.get('max_items', 50)]
-                break
-        
-        if not property_elements:
-            property_elements = await self._find_repeated_elements(page)
-        
-        for element in property_elements:
-            try:
-                property_data = {}
-                
-                # Title
-                title_selectors = [
-                    'h1', 'h2', 'h3', '[class*="title"]', '[class*="name"]',
-                    '.property-title', '.listing-title', 'a[title]'
-                ]
-                property_data['title'] = await self._extract_text_by_selectors(element, title_selectors)
-                
-                # Price
-                price_selectors = [
-                    '[class*="price"]', '[class*="cost"]', '[class*="rent"]',
-                    '.property-price', '.listing-price', '[data-testid*="price"]'
-                ]
-                property_data['price'] = await self._extract_text_by_selectors(element, price_selectors)
-                
-                # Location
-                location_selectors = [
-                    '[class*="location"]', '[class*="address"]', '[class*="area"]',
-                    '.property-location', '.listing-location', '.address'
-                ]
-                property_data['location'] = await self._extract_text_by_selectors(element, location_selectors)
-                
-                # Area
-                area_selectors = [
-                    '[class*="area"]', '[class*="size"]', '[class*="sqft"]',
-                    '.property-area', '.carpet-area', '.built-area'
-                ]
-                property_data['area'] = await self._extract_text_by_selectors(element, area_selectors)
-                
-                # Bedrooms
-                bedroom_selectors = [
-                    '[class*="bedroom"]', '[class*="bhk"]', '[class*="bed"]',
-                    '.bedrooms', '.bhk-info', '[data-testid*="bedroom"]'
-                ]
-                property_data['bedrooms'] = await self._extract_text_by_selectors(element, bedroom_selectors)
-                
-                # Bathrooms
-                bathroom_selectors = [
-                    '[class*="bathroom"]', '[class*="bath"]', '[class*="toilet"]',
-                    '.bathrooms', '.bath-info', '[data-testid*="bathroom"]'
-                ]
-                property_data['bathrooms'] = await self._extract_text_by_selectors(element, bathroom_selectors)
-                
-                if property_data.get('title') or property_data.get('price'):
-                    properties.append(property_data)
+                    # Add metadata to each result
+                    static_meta = {
+                        'source_url': website_info.url,
+                        'source_domain': website_info.domain,
+                        'scraped_at': datetime.now(),
+                        'confidence_score': website_info.confidence_score
+                    }
+                    for result in results:
+                        result.update(static_meta)
                     
-            except Exception as e:
-                logger.debug(f"Error extracting property: {str(e)}")
-                continue
-        
-        return properties
-    
-    async def _extract_general_content(self, page, requirements: Dict) -> List[Dict]:
-        """Extract general page content"""
-        content_items = []
-        
-        # Try to find structured content first
-        structured_selectors = [
-            'article', '.post', '.entry', '.content-item', '.card',
-            '.item', '.listing', '.result', '[class*="item"]'
-        ]
-        
-        elements = []
-        for selector in structured_selectors:
-            found_elements = await page.query_selector_all(selector)
-            if found_elements:
-                elements = found_elements[:requirements.get('max_items', 50)]
-                break
-        
-        # Fallback to paragraphs and headers
-        if not elements:
-            elements = await page.query_selector_all('p, h1, h2, h3, h4, h5, h6')
-            elements = elements[:requirements.get('max_items', 50)]
-        
-        for element in elements:
-            try:
-                content = {}
-                
-                # Extract title (header or first line)
-                if await element.evaluate('el => el.tagName.toLowerCase()') in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                    content['title'] = await element.inner_text()
-                    content['type'] = 'heading'
-                else:
-                    title_element = await element.query_selector('h1, h2, h3, h4, h5, h6, [class*="title"]')
-                    if title_element:
-                        content['title'] = await title_element.inner_text()
+                    if results:
+                        logger.info("Successfully scraped %s items from %s", len(results), website_info.domain)
+                        break
                     else:
-                        text = await element.inner_text()
-                        content['title'] = text[:100] + '...' if len(text) > 100 else text
-                    content['type'] = 'content'
-                
-                # Extract full content
-                content['content'] = await element.inner_text()
-                
-                # Extract URL if it's a link
-                if requirements.get('include_links'):
-                    link_element = await element.query_selector('a')
-                    if link_element:
-                        content['url'] = await link_element.get_attribute('href')
-                
-                if content.get('content') and len(content['content'].strip()) > 10:
-                    content_items.append(content)
-                    
-            except Exception as e:
-                logger.debug(f"Error extracting content: {str(e)}")
-                continue
+                        logger.warning("No data extracted from %s on attempt %s", website_info.domain, attempt + 1)
+                        
+                except Exception as e:
+                    logger.error("Error scraping %s (attempt %s): %s", website_info.url, attempt + 1, e)
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(self.retry_delay * (2 ** attempt))
+                    else:
+                        logger.error("Failed to scrape %s after %s attempts", website_info.url, self.max_retries)
+        finally:
+            # Scrapers live for a single request, so a finished page is never
+            # reused; close it to free its renderer while sibling scrapes run
+            if not page.is_closed():
+                await page.close()
         
-        return content_items
+        return results
     
-    async def _find_repeated_elements(self, page) -> List:
-        """Find repeated elements on the page using pattern detection"""
+    async def _open_page(self):
+        """Open a page in this scraper's context with resource blocking applied"""
+        page = await self.context.new_page()
+        await self._block_resources(page)
+        return page
+    
+    async def _extract_with_schema(self, page, requirements: Dict, schema: Dict) -> List[Dict]:
+        """Extract repeated items described by an extraction schema in a single browser round trip"""
         try:
-            # Get all elements with class or id attributes
-            elements = await page.query_selector_all('[class], [id]')
-            
-            # Group by similar class names
-            class_groups = {}
-            for element in elements:
-                classes = await element.get_attribute('class')
-                if classes:
-                    # Get the first class name as grouping key
-                    first_class = classes.split()[0] if classes.split() else 'unknown'
-                    if first_class not in class_groups:
-                        class_groups[first_class] = []
-                    class_groups[first_class].append(element)
-            
-            # Find the largest group with meaningful content
-            largest_group = []
-            max_size = 0
-            
-            for class_name, group in class_groups.items():
-                if len(group) > max_size and len(group) >= 3:  # At least 3 similar elements
-                    # Check if elements have meaningful content
-                    sample_element = group[0]
-                    sample_text = await sample_element.inner_text()
-                    if sample_text and len(sample_text.strip()) > 20:
-                        largest_group = group
-                        max_size = len(group)
-            
-            return largest_group[:50]  # Limit to 50 elements
-            
+            return await page.evaluate(self.SCHEMA_EXTRACT_SCRIPT, {
+                'containers': schema['containers'],
+                'fields': schema['fields'],
+                'required': schema['required'],
+                'max': requirements.get('max_items', 50),
+                'imageField': schema.get('image_field') if requirements.get('include_images') else None,
+                'linkField': schema.get('link_field') if requirements.get('include_links') else None
+            })
         except Exception as e:
-            logger.debug(f"Error finding repeated elements: {str(e)}")
+            logger.debug("Error extracting %s: %s", schema['label'], e)
             return []
     
-    async def _extract_text_by_selectors(self, element, selectors: List[str]) -> str:
-        """Extract text using multiple selector strategies"""
-        for selector in selectors:
-            try:
-                target_element = await element.query_selector(selector)
-                if target_element:
-                    text = await target_element.inner_text()
-                    if text and text.strip():
-                        return text.strip()
-            except Exception:
-                continue
-        return ""
+    async def _extract_general_content(self, page, requirements: Dict, schema: Dict) -> List[Dict]:
+        """Extract general page content in a single browser round trip"""
+        try:
+            return await page.evaluate(self.GENERAL_CONTENT_SCRIPT, {
+                'selectors': schema['containers'],
+                'fallback': schema['fallback'],
+                'max': requirements.get('max_items', 50),
+                'includeLinks': requirements.get('include_links', False)
+            })
+        except Exception as e:
+            logger.debug("Error extracting content: %s", e)
+            return []
 
 
 class WebScrapingAPI:
     """FastAPI application for intelligent web scraping"""
     
+    # Rows written per streamed CSV chunk
+    CSV_CHUNK_ROWS = 500
+    
+    # Concurrency ceilings for website scraping
+    MAX_CONCURRENT_SCRAPES = int(os.getenv("MAX_CONCURRENT_SCRAPES", "8"))
+    MAX_CONCURRENT_PER_HOST = int(os.getenv("MAX_CONCURRENT_PER_HOST", "4"))
+    
+    # Per-user sliding-window rate limit for /scrape-advanced
+    RATE_LIMIT_MAX_REQUESTS = int(os.getenv("RATE_LIMIT_MAX_REQUESTS", "50"))
+    RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "3600"))
+    
+    # Per-website result cache in Redis: rows are fresh for a content-type TTL
+    # (prices move fastest) and kept for a day as a fallback when a scrape fails
+    RESULT_CACHE_TTL_SECONDS = {
+        ContentType.PRODUCTS: 15 * 60,
+        ContentType.NEWS: 15 * 60,
+        ContentType.JOBS: 60 * 60,
+        ContentType.REAL_ESTATE: 60 * 60,
+        ContentType.GENERAL: 60 * 60
+    }
+    RESULT_CACHE_STALE_SECONDS = 24 * 60 * 60
+    
     def __init__(self):
         self.app = FastAPI(
             title="Intelligent Web Scraper",
             description="AI-powered web scraping with natural language prompts",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse
         )
+        self._global_sem = asyncio.Semaphore(self.MAX_CONCURRENT_SCRAPES)
+        self._host_sems = defaultdict(lambda: asyncio.Semaphore(self.MAX_CONCURRENT_PER_HOST))
+        
+        # Redis client for per-user rate limiting and the result cache (disabled without REDIS_URL)
+        self.redis = None
+        self.app.add_event_handler("startup", self._open_redis)
+        self.app.add_event_handler("shutdown", self._close_redis)
+        
+        # Shared Chromium is launched lazily by the first scrape
+        self.app.add_event_handler("shutdown", StealthScraper.shutdown_browser)
+        
         self.setup_routes()
     
+    async def _open_redis(self):
+        """Connect the Redis client if configured"""
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            self.redis = aioredis.from_url(redis_url)
+    
+    async def _close_redis(self):
+        """Close the Redis client"""
+        if self.redis:
+            await self.redis.aclose()
+            self.redis = None
+    
+    async def _allow_request(self, user_id: str) -> Tuple[bool, int]:
+        """
+        Sliding-window rate limit backed by a Redis sorted set
+        Returns (allowed, retry_after_seconds)
+        """
+        if not self.redis:
+            return True, 0
+        
+        key = f"rl:{user_id}"
+        now_ms = int(time.time() * 1000)
+        window_ms = self.RATE_LIMIT_WINDOW_SECONDS * 1000
+        member = f"{now_ms}-{uuid.uuid4().hex}"
+        
+        try:
+            # Add first and count in the same MULTI so concurrent requests
+            # always see each other; a request over the limit removes itself
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(key, 0, now_ms - window_ms)
+                pipe.zadd(key, {member: now_ms})
+                pipe.zcard(key)
+                pipe.zrange(key, 0, 0, withscores=True)
+                pipe.expire(key, self.RATE_LIMIT_WINDOW_SECONDS)
+                _, _, count, oldest, _ = await pipe.execute()
+            
+            if count > self.RATE_LIMIT_MAX_REQUESTS:
+                await self.redis.zrem(key, member)
+                if oldest:
+                    retry_after = math.ceil((oldest[0][1] + window_ms - now_ms) / 1000)
+                else:
+                    retry_after = self.RATE_LIMIT_WINDOW_SECONDS
+                return False, max(retry_after, 1)
+        except RedisError as e:
+            # Fail open so a Redis outage does not take scraping down
+            logger.error("Rate limit check failed for %s: %s", user_id, e)
+        
+        return True, 0
+    
+    @staticmethod
+    def _extend_unique(all_data: List[Dict], seen_rows: set, rows: List[Dict]):
+        """Append rows whose content fingerprint has not been seen yet"""
+        for row in rows:
+            content = {k: v for k, v in row.items() if k != 'scraped_at'}
+            key = hashlib.blake2b(
+                json.dumps(content, sort_keys=True, default=str).encode('utf-8'),
+                digest_size=16
+            ).digest()
+            if key in seen_rows:
+                continue
+            seen_rows.add(key)
+            all_data.append(row)
+    
+    # Extraction requirements that change which rows a scrape returns; output
+    # format and retry flags do not, so requests differing only in those share a key
+    RESULT_CACHE_KEY_FIELDS = ('max_items', 'include_images', 'include_links')
+    
+    @classmethod
+    def _result_cache_key(cls, website: WebsiteInfo, extraction_requirements: Dict) -> str:
+        """Redis key for one website's rows under the given extraction requirements"""
+        fingerprint = json.dumps(
+            [
+                website.url,
+                website.content_type.value,
+                [extraction_requirements.get(field) for field in cls.RESULT_CACHE_KEY_FIELDS]
+            ],
+            default=str
+        )
+        return f"scrape:result:{hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()}"
+    
+    async def _get_cached_result(self, key: str) -> Optional[Dict]:
+        """Return the cached {'fetched_at', 'rows'} entry for a key, if any"""
+        if not self.redis:
+            return None
+        try:
+            payload = await self.redis.get(key)
+            if not payload:
+                return None
+            cached = orjson.loads(payload)
+            # Rows are cached with scraped_at as an ISO string; restore the
+            # datetime so cached and fresh rows serialise the same way
+            for row in cached['rows']:
+                if isinstance(row.get('scraped_at'), str):
+                    row['scraped_at'] = datetime.fromisoformat(row['scraped_at'])
+            return cached
+        except (RedisError, orjson.JSONDecodeError, ValueError) as e:
+            logger.error("Result cache read failed for %s: %s", key, e)
+            return None
+    
+    async def _store_cached_result(self, key: str, rows: List[Dict]):
+        """Cache a website's rows, keeping them long enough to serve stale on failure"""
+        if not self.redis:
+            return
+        try:
+            payload = orjson.dumps({'fetched_at': time.time(), 'rows': rows}, default=str)
+            await self.redis.set(key, payload, ex=self.RESULT_CACHE_STALE_SECONDS)
+        except (RedisError, TypeError) as e:
+            logger.error("Result cache write failed for %s: %s", key, e)
+    
+    async def _bounded_scrape(self, scraper: 'StealthScraper', website: WebsiteInfo, 
+                              extraction_requirements: Dict) -> List[Dict]:
+        """
+        Scrape a website within the global and per-host concurrency limits,
+        serving fresh rows from the result cache and stale rows if the scrape fails
+        """
+        cache_key = self._result_cache_key(website, extraction_requirements)
+        cached = await self._get_cached_result(cache_key)
+        fresh_for = self.RESULT_CACHE_TTL_SECONDS.get(
+            website.content_type, self.RESULT_CACHE_TTL_SECONDS[ContentType.GENERAL]
+        )
+        if cached and time.time() - cached['fetched_at'] < fresh_for:
+            return cached['rows']
+        
+        try:
+            async with self._global_sem, self._host_sems[website.domain]:
+                rows = await scraper.scrape_website(website, extraction_requirements)
+        except Exception:
+            if cached:
+                logger.warning("Scrape of %s failed, serving cached rows", website.url)
+                return cached['rows']
+            raise
+        
+        if rows:
+            await self._store_cached_result(cache_key, rows)
+        elif cached:
+            logger.warning("No data from %s, serving cached rows", website.url)
+            return cached['rows']
+        
+        return rows
+    
     def setup_routes(self):
         """Setup API routes"""
         
@@ -1238,20 +1376,20 @@ class WebScrapingAPI:
                     return {"error": "Prompt is required", "success": False}
                 
                 # Parse prompt using intelligent parser
-                parsed_data = IntelligentPromptParser.parse_comprehensive_prompt(prompt)
+                parsed_data = IntelligentPromptParser.parse_prompt_cached(prompt)
                 
                 # Update extraction requirements
                 parsed_data['extraction_requirements']['max_items'] = max_items
                 parsed_data['extraction_requirements']['include_images'] = include_images
                 parsed_data['extraction_requirements']['data_format'] = output_format
                 
-                start_time = datetime.now()
+                start_time = time.monotonic()
                 
                 # Scrape websites in parallel
                 async with StealthScraper() as scraper:
                     tasks = []
                     for website in parsed_data['target_websites']:
-                        task = scraper.scrape_website(website, parsed_data['extraction_requirements'])
+                        task = self._bounded_scrape(scraper, website, parsed_data['extraction_requirements'])
                         tasks.append(task)
                     
                     if tasks:
@@ -1261,6 +1399,7 @@ class WebScrapingAPI:
                 
                 # Aggregate results
                 all_data = []
+                seen_rows = set()
                 successful_websites = 0
                 failed_websites = []
                 
@@ -1271,7 +1410,7 @@ class WebScrapingAPI:
                             'error': str(result)
                         })
                     elif result:
-                        all_data.extend(result)
+                        self._extend_unique(all_data, seen_rows, result)
                         successful_websites += 1
                     else:
                         failed_websites.append({
@@ -1279,8 +1418,8 @@ class WebScrapingAPI:
                             'error': 'No data extracted'
                         })
                 
-                end_time = datetime.now()
-                scraping_time = (end_time - start_time).total_seconds()
+                scraping_time = time.monotonic() - start_time
+                scraped_at = datetime.now()
                 
                 # Prepare response metadata
                 metadata = {
@@ -1292,7 +1431,7 @@ class WebScrapingAPI:
                     'scraping_time_seconds': scraping_time,
                     'content_type': parsed_data['content_type'].value,
                     'extraction_confidence': parsed_data['confidence_score'],
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': scraped_at
                 }
                 
                 # Return data in requested format
@@ -1305,7 +1444,7 @@ class WebScrapingAPI:
                     }
                     
             except Exception as e:
-                logger.error(f"Error in scrape endpoint: {str(e)}")
+                logger.error("Error in scrape endpoint: %s", e)
                 return {
                     'error': f"Internal server error: {str(e)}",
                     'success': False,
@@ -1320,84 +1459,37 @@ class WebScrapingAPI:
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint"""
-            return {"status": "healthy", "timestamp": datetime.now().isoformat()}
-        async def _return_csv(self, data: List[Dict], metadata: Dict):
-            """Return data as CSV format"""
-            if not data:
-                return {"error": "No data to convert to CSV", "success": False}
-            
-            try:
-                import io
-                import csv
-                
-                output = io.StringIO()
-                
-                # Get all unique keys from all records
-                all_keys = set()
-                for item in data:
-                    all_keys.update(item.keys())
-                
-                fieldnames = sorted(list(all_keys))
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for item in data:
-                    # Handle nested dictionaries by converting to strings
-                    row = {}
-                    for key in fieldnames:
-                        value = item.get(key, '')
-                        if isinstance(value, (dict, list)):
-                            row[key] = str(value)
-                        else:
-                            row[key] = value
-                    writer.writerow(row)
-                
-                csv_content = output.getvalue()
-                output.close()
-                
-                return {
-                    'data': csv_content,
-                    'format': 'csv',
-                    'metadata': metadata
-                }
-                
-            except Exception as e:
-                logger.error(f"Error converting to CSV: {str(e)}")
-                return {
-                    'data': data,
-                    'format': 'json',
-                    'metadata': metadata,
-                    'csv_error': str(e)
-                }
+            return {"status": "healthy", "timestamp": datetime.now()}
+        # Root payload is static, so serialize it once
+        root_body = orjson.dumps({
+            "message": "Intelligent Web Scraper API",
+            "version": "1.0.0",
+            "description": "AI-powered web scraping with natural language prompts",
+            "endpoints": {
+                "POST /scrape": "Main scraping endpoint - provide a natural language prompt",
+                "GET /health": "Health check endpoint",
+                "GET /": "This information endpoint"
+            },
+            "example_usage": {
+                "prompt": "Get latest iPhone prices from Amazon and Flipkart",
+                "max_items": 50,
+                "include_images": False,
+                "output_format": "json"
+            },
+            "supported_content_types": [
+                "products/ecommerce",
+                "jobs/careers",
+                "news/articles",
+                "real_estate/properties",
+                "general_content"
+            ],
+            "status": "operational"
+        })
         
         @self.app.get("/")
         async def root():
             """Root endpoint with API information"""
-            return {
-                "message": "Intelligent Web Scraper API",
-                "version": "1.0.0",
-                "description": "AI-powered web scraping with natural language prompts",
-                "endpoints": {
-                    "POST /scrape": "Main scraping endpoint - provide a natural language prompt",
-                    "GET /health": "Health check endpoint",
-                    "GET /": "This information endpoint"
-                },
-                "example_usage": {
-                    "prompt": "Get latest iPhone prices from Amazon and Flipkart",
-                    "max_items": 50,
-                    "include_images": False,
-                    "output_format": "json"
-                },
-                "supported_content_types": [
-                    "products/ecommerce",
-                    "jobs/careers",
-                    "news/articles",
-                    "real_estate/properties",
-                    "general_content"
-                ],
-                "status": "operational",
-                "timestamp": datetime.now().isoformat()
-            }
+            return Response(content=root_body, media_type="application/json")
         
         @self.app.post("/scrape-advanced")
         async def scrape_advanced_endpoint(request: dict):
@@ -1417,15 +1509,20 @@ class WebScrapingAPI:
                 
                 # Check rate limits if user_id provided
                 if user_id:
-                    from datetime import timedelta
-                    today = datetime.now().date()
-                    
-                    # Count today's scrapes for this user (would use MongoDB in production)
-                    # For now, we'll trust the frontend to manage this
-                    pass
+                    allowed, retry_after = await self._allow_request(user_id)
+                    if not allowed:
+                        return ORJSONResponse(
+                            status_code=429,
+                            content={
+                                "error": "Rate limit exceeded. Please try again later.",
+                                "success": False,
+                                "retry_after_seconds": retry_after
+                            },
+                            headers={"Retry-After": str(retry_after)}
+                        )
                 
                 # Parse prompt using intelligent parser
-                parsed_data = IntelligentPromptParser.parse_comprehensive_prompt(prompt)
+                parsed_data = IntelligentPromptParser.parse_prompt_cached(prompt)
                 
                 # Update extraction requirements with advanced options
                 parsed_data['extraction_requirements'].update({
@@ -1443,13 +1540,13 @@ class WebScrapingAPI:
                         "suggestion": "Try: 'Get iPhone prices from amazon.com and flipkart.com'"
                     }
                 
-                start_time = datetime.now()
+                start_time = time.monotonic()
                 
                 # Initialize scraper and perform scraping
                 async with StealthScraper() as scraper:
                     tasks = []
                     for website in parsed_data['target_websites']:
-                        task = scraper.scrape_website(website, parsed_data['extraction_requirements'])
+                        task = self._bounded_scrape(scraper, website, parsed_data['extraction_requirements'])
                         tasks.append(task)
                     
                     # Execute all scraping tasks
@@ -1457,50 +1554,55 @@ class WebScrapingAPI:
                 
                 # Process and aggregate results
                 all_data = []
+                seen_rows = set()
                 successful_websites = 0
                 failed_websites = []
+                failed_append = failed_websites.append
+                extend_unique = self._extend_unique
+                websites_identified = []
+                domain_append = websites_identified.append
                 
-                for i, result in enumerate(results):
-                    website_info = parsed_data['target_websites'][i]
+                for website_info, result in zip(parsed_data['target_websites'], results):
+                    domain_append(website_info.domain)
                     
                     if isinstance(result, Exception):
-                        failed_websites.append({
+                        failed_append({
                             'url': website_info.url,
                             'domain': website_info.domain,
                             'error': str(result),
                             'error_type': type(result).__name__
                         })
-                        logger.error(f"Failed to scrape {website_info.url}: {str(result)}")
-                    elif result and len(result) > 0:
-                        all_data.extend(result)
+                        logger.error("Failed to scrape %s: %s", website_info.url, result)
+                    elif result:
+                        extend_unique(all_data, seen_rows, result)
                         successful_websites += 1
-                        logger.info(f"Successfully scraped {len(result)} items from {website_info.domain}")
+                        logger.info("Successfully scraped %s items from %s", len(result), website_info.domain)
                     else:
-                        failed_websites.append({
+                        failed_append({
                             'url': website_info.url,
                             'domain': website_info.domain,
                             'error': 'No data extracted - possible structure mismatch',
                             'error_type': 'NoDataError'
                         })
                 
-                end_time = datetime.now()
-                scraping_time = (end_time - start_time).total_seconds()
+                scraping_time = time.monotonic() - start_time
+                scraped_at = datetime.now()
                 
                 # Create comprehensive metadata
                 metadata = {
                     'success': len(all_data) > 0,
                     'record_count': len(all_data),
                     'websites_scraped_successfully': successful_websites,
-                    'total_websites_attempted': len(parsed_data['target_websites']),
-                    'success_rate': f"{(successful_websites / len(parsed_data['target_websites']) * 100):.1f}%" if parsed_data['target_websites'] else "0%",
+                    'total_websites_attempted': len(websites_identified),
+                    'success_rate': f"{(successful_websites / len(websites_identified) * 100):.1f}%" if websites_identified else "0%",
                     'failed_websites': failed_websites,
                     'scraping_time_seconds': round(scraping_time, 2),
                     'content_type_detected': parsed_data['content_type'].value,
                     'extraction_confidence': parsed_data['confidence_score'],
-                    'scraped_at': datetime.now().isoformat(),
+                    'scraped_at': scraped_at,
                     'prompt_analysis': {
                         'original_prompt': prompt,
-                        'websites_identified': [w.domain for w in parsed_data['target_websites']],
+                        'websites_identified': websites_identified,
                         'content_type': parsed_data['content_type'].value
                     }
                 }
@@ -1518,7 +1620,7 @@ class WebScrapingAPI:
                     }
                     
             except Exception as e:
-                logger.error(f"Error in advanced scrape endpoint: {str(e)}")
+                logger.error("Error in advanced scrape endpoint: %s", e)
                 return {
                     'error': f"Internal server error: {str(e)}",
                     'success': False,
@@ -1530,51 +1632,126 @@ class WebScrapingAPI:
                         'error_details': str(e)
                     }
                 }
-        
-        async def _return_excel(self, data: List[Dict], metadata: Dict):
-            """Return data as Excel format"""
-            try:
-                import io
-                import pandas as pd
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(data)
-                
-                # Create Excel file in memory
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, sheet_name='Scraped_Data', index=False)
-                    
-                    # Add metadata sheet
-                    metadata_df = pd.DataFrame([metadata])
-                    metadata_df.to_excel(writer, sheet_name='Metadata', index=False)
-                
-                excel_data = output.getvalue()
-                output.close()
-                
-                # Return base64 encoded for JSON response
-                import base64
-                excel_b64 = base64.b64encode(excel_data).decode('utf-8')
-                
-                return {
-                    'data': excel_b64,
-                    'format': 'excel',
-                    'filename': f"scraped_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    'metadata': metadata
-                }
-                
-            except ImportError:
-                logger.warning("pandas/openpyxl not available, falling back to CSV")
-                return await self._return_csv(data, metadata)
-            except Exception as e:
-                logger.error(f"Error creating Excel file: {str(e)}")
-                return {
-                    'data': data,
-                    'format': 'json',
-                    'metadata': metadata,
-                    'excel_error': str(e)
+    
+    async def _return_excel(self, data: List[Dict], metadata: Dict):
+        """Return data as an Excel file download"""
+        try:
+            # Workbook serialization is CPU-bound, keep it off the event loop
+            loop = asyncio.get_running_loop()
+            excel_data = await loop.run_in_executor(None, self._build_xlsx, data, metadata)
+            
+            return StreamingResponse(
+                iter([excel_data]),
+                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                headers={
+                    "Content-Disposition": f"attachment; filename=scraped_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                    "X-Scrape-Metadata": json.dumps(metadata, default=str)
                 }
-
+            )
+            
+        except ImportError:
+            logger.warning("openpyxl not available, falling back to CSV")
+            return await self._return_csv(data, metadata)
+        except Exception as e:
+            logger.error("Error creating Excel file: %s", e)
+            return {
+                'data': data,
+                'format': 'json',
+                'metadata': metadata,
+                'excel_error': str(e)
+            }
+    
+    def _build_xlsx(self, data: List[Dict], metadata: Dict) -> bytes:
+        """Serialize records and metadata into xlsx bytes"""
+        from openpyxl import Workbook
+        
+        # Write-only workbooks stream rows instead of holding styled cells
+        workbook = Workbook(write_only=True)
+        
+        fieldnames = list(dict.fromkeys(key for item in data for key in item))
+        data_sheet = workbook.create_sheet('Scraped_Data')
+        data_sheet.append(fieldnames)
+        for item in data:
+            data_sheet.append([self._excel_value(item.get(key)) for key in fieldnames])
+        
+        # Add metadata sheet
+        metadata_sheet = workbook.create_sheet('Metadata')
+        metadata_sheet.append(list(metadata.keys()))
+        metadata_sheet.append([
+            json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+            for value in metadata.values()
+        ])
+        
+        output = io.BytesIO()
+        workbook.save(output)
+        excel_data = output.getvalue()
+        output.close()
+        return excel_data
+    
+    @staticmethod
+    def _excel_value(value):
+        """Convert nested values to strings so openpyxl can store them"""
+        return str(value) if isinstance(value, (dict, list)) else value
+    
+    async def _return_csv(self, data: List[Dict], metadata: Dict):
+        """Stream data as CSV, flushing a chunk of rows at a time"""
+        if not data:
+            return {"error": "No data to convert to CSV", "success": False}
+        
+        try:
+            import pandas as pd
+            chunks = self._csv_chunks_pandas(pd, data)
+        except ImportError:
+            logger.warning("pandas not available, writing CSV with csv module")
+            chunks = self._csv_chunks_stdlib(data)
+        
+        return StreamingResponse(
+            chunks,
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=scraped_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                "X-Scrape-Metadata": json.dumps(metadata, default=str)
+            }
+        )
+    
+    def _csv_chunks_pandas(self, pd, data: List[Dict]):
+        """Yield CSV chunks rendered by pandas' C writer"""
+        df = pd.DataFrame.from_records(data)
+        
+        # Handle nested dictionaries by converting to strings
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].map(lambda v: str(v) if isinstance(v, (dict, list)) else v)
+        
+        for start in range(0, len(df), self.CSV_CHUNK_ROWS):
+            chunk = df.iloc[start:start + self.CSV_CHUNK_ROWS]
+            yield chunk.to_csv(index=False, header=(start == 0)).encode('utf-8')
+    
+    def _csv_chunks_stdlib(self, data: List[Dict]):
+        """Yield CSV chunks written row by row with the csv module"""
+        # Column order follows first appearance across records
+        fieldnames = list(dict.fromkeys(key for item in data for key in item))
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fieldnames)
+        
+        for index, item in enumerate(data, 1):
+            # Handle nested dictionaries by converting to strings
+            row = []
+            for key in fieldnames:
+                value = item.get(key, '')
+                row.append(str(value) if isinstance(value, (dict, list)) else value)
+            writer.writerow(row)
+            
+            if index % self.CSV_CHUNK_ROWS == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate(0)
+        
+        remaining = buffer.getvalue()
+        if remaining:
+            yield remaining.encode('utf-8')
+        buffer.close()
 
 # Initialize FastAPI application
 app = WebScrapingAPI().app
@@ -1596,43 +1773,77 @@ import time
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Log request
-    logger.info(f"Request: {request.method} {request.url}")
+    logger.info("Request: %s %s", request.method, request.url)
     
     response = await call_next(request)
     
     # Log response
-    process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} - {process_time:.2f}s")
+    process_time = time.perf_counter() - start_time
+    logger.info("Response: %s - %.2fs", response.status_code, process_time)
     
     return response
 
+# Reject oversized request bodies before they are read
+MAX_REQUEST_BODY_BYTES = 64 * 1024
+BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+@app.middleware("http")
+async def limit_request_body(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    
+    # Chunked bodies carry no size up front and would be read whole by the
+    # route, so body-carrying requests must declare their length
+    if request.method in BODY_METHODS and (
+        content_length is None or "transfer-encoding" in request.headers
+    ):
+        return ORJSONResponse(
+            status_code=411,
+            content={"error": "Content-Length header required", "success": False}
+        )
+    
+    if content_length:
+        try:
+            body_size = int(content_length)
+        except ValueError:
+            return ORJSONResponse(
+                status_code=400,
+                content={"error": "Invalid Content-Length header", "success": False}
+            )
+        
+        if body_size > MAX_REQUEST_BODY_BYTES:
+            return ORJSONResponse(
+                status_code=413,
+                content={"error": "Request body too large", "success": False}
+            )
+    
+    return await call_next(request)
+
 # Production-ready error handlers
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
             "success": False,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "success": False,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     )
 
@@ -1656,11 +1867,14 @@ if __name__ == "__main__":
     
     # Production configuration
     uvicorn.run(
-        "main:api",
+        "main:app",
         host="0.0.0.0",
         port=8000,
         workers=1,  # Single worker for Playwright compatibility
         log_level="info",
         access_log=True,
-        reload=False  # Set to True for development
+        reload=False,  # Set to True for development
+        limit_concurrency=64,  # Excess connections get 503 instead of queueing
+        backlog=128,
+        timeout_keep_alive=5
     )
\ No newline at end of file
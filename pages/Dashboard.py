@@ -1,94 +1,34 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from datetime import datetime
 import io
-import base64
-from utils.auth_utils import AuthManager, require_auth, require_admin
+from openpyxl import Workbook
+from utils.auth_utils import get_auth_manager, require_auth, require_admin
 from utils.scraper_utils import scrape_data
 from utils.robots_utils import is_allowed_to_scrape
 import plotly.express as px
 import plotly.graph_objects as go
 import re
-from utils.ui_utils import hide_streamlit_sidebar, apply_custom_styling
+from concurrent.futures import ThreadPoolExecutor
+from utils.ui_utils import apply_page_styling
+
+URL_PATTERN = re.compile(r'https?://\S+')
+NUMBER_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Rows shown in the history and admin scrape tables
+HISTORY_PAGE_SIZE = 100
+
+# Upper bound on concurrent robots.txt fetches for a multi-URL prompt
+ROBOTS_CHECK_WORKERS = 8
+
+# Quote CSV fields only when needed, matching df.to_csv
+CSV_WRITE_OPTIONS = pa_csv.WriteOptions(quoting_style="needed")
 
 # Hide sidebar immediately when page loads
-hide_streamlit_sidebar()
-apply_custom_styling()
-# CSS for the logout button and header
-st.markdown("""
-<style>
-    /* Top header bar with logout button */
-    .header-bar {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 1rem 2rem;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    }
-    
-    .header-title {
-        font-size: 1.5rem;
-        font-weight: bold;
-        margin: 0;
-    }
-    
-    .logout-btn {
-        background: rgba(255,255,255,0.2);
-        border: 1px solid rgba(255,255,255,0.3);
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        color: white;
-        text-decoration: none;
-        transition: all 0.3s ease;
-        cursor: pointer;
-        font-weight: 500;
-    }
-    
-    .logout-btn:hover {
-        background: rgba(255,255,255,0.3);
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-    }
-    
-    /* Navigation pills */
-    .nav-pills {
-        display: flex;
-        gap: 1rem;
-        margin-bottom: 2rem;
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 10px;
-    }
-    
-    .nav-pill {
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        border: none;
-        background: white;
-        color: #666;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        text-decoration: none;
-    }
-    
-    .nav-pill.active {
-        background: #667eea;
-        color: white;
-    }
-    
-    .nav-pill:hover {
-        background: #667eea;
-        color: white;
-        transform: translateY(-2px);
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_page_styling(dashboard=True)
 
 def show_header_with_logout():
     """Show header bar with logout button"""
@@ -150,31 +90,65 @@ def show_navigation_pills():
                 st.session_state.page = page_key
                 st.rerun()
 
+@st.cache_data(ttl=30, show_spinner=False)
+def load_user_stats(user_id):
+    """Dashboard metrics for a user, cached briefly across reruns"""
+    return get_auth_manager().get_user_stats(user_id)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_user_scrapes(user_id):
+    """Most recent page of a user's scrapes, cached briefly across reruns"""
+    return get_auth_manager().get_user_scrapes(user_id, limit=HISTORY_PAGE_SIZE)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_scrape_results(user_id, scrape_id):
+    """Result rows of one stored scrape; saved scrapes never change, so no TTL"""
+    return get_auth_manager().get_scrape_results(user_id, scrape_id)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_history_table(user_id):
+    """Formatted history table for a user, rebuilt only when the scrapes change"""
+    return build_scrape_table(load_user_scrapes(user_id), include_id=True)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_admin_overview():
+    """All users, global scrape stats and the latest scrapes for the admin panel"""
+    auth_manager = get_auth_manager()
+    return (
+        auth_manager.get_all_users_admin(),
+        auth_manager.get_scrape_stats_admin(),
+        auth_manager.get_all_scrapes_admin(limit=HISTORY_PAGE_SIZE)
+    )
+
+def check_robots_for_urls(user_agent, urls):
+    """Check robots.txt for every URL concurrently, returning the disallowed ones"""
+    with ThreadPoolExecutor(max_workers=min(ROBOTS_CHECK_WORKERS, len(urls))) as pool:
+        verdicts = list(pool.map(lambda url: is_allowed_to_scrape(user_agent, url), urls))
+    
+    return [url for url, allowed in zip(urls, verdicts) if not allowed]
+
 def show_dashboard():
     """Main dashboard for authenticated users"""
     require_auth()
     
     # Quick stats
-    auth_manager = AuthManager()
-    user_scrapes = auth_manager.get_user_scrapes(st.session_state.user['id'])
+    auth_manager = get_auth_manager()
+    stats = load_user_stats(st.session_state.user['id'])
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Scrapes", len(user_scrapes))
+        st.metric("Total Scrapes", stats['total'])
     
     with col2:
-        recent_scrapes = [s for s in user_scrapes if s['created_at'] > datetime.utcnow() - timedelta(days=7)]
-        st.metric("This Week", len(recent_scrapes))
+        st.metric("This Week", stats['recent'])
     
     with col3:
-        successful_scrapes = [s for s in user_scrapes if s['status'] == 'completed']
-        success_rate = (len(successful_scrapes) / len(user_scrapes) * 100) if user_scrapes else 0
+        success_rate = (stats['successes'] / stats['total'] * 100) if stats['total'] else 0
         st.metric("Success Rate", f"{success_rate:.1f}%")
     
     with col4:
-        total_records = sum(s.get('record_count', 0) for s in user_scrapes)
-        st.metric("Total Records", total_records)
+        st.metric("Total Records", stats['records'])
     
     st.markdown("---")
     
@@ -211,14 +185,13 @@ def show_dashboard():
         else:
             # Check robots.txt compliance for non-admin users
             user_agent = "MyScraperBot"
-            urls = re.findall(r'https?://[^\s]+', prompt)
-            target_url = urls[0] if urls else None
+            urls = list(dict.fromkeys(URL_PATTERN.findall(prompt)))
             is_admin = st.session_state.user.get("is_admin", False)
             
-            if target_url and not is_admin:
-                allowed = is_allowed_to_scrape(user_agent, target_url)
-                if not allowed:
-                    st.error("🚫 robots.txt disallows scraping this site for your role.")
+            if urls and not is_admin:
+                disallowed = check_robots_for_urls(user_agent, urls)
+                if disallowed:
+                    st.error(f"🚫 robots.txt disallows scraping {', '.join(disallowed)} for your role.")
                     st.stop()
             
             scraping_container = st.container()
@@ -249,6 +222,10 @@ def show_dashboard():
                             website,
                             results
                         )
+                        load_user_stats.clear()
+                        load_user_scrapes.clear()
+                        load_history_table.clear()
+                        load_admin_overview.clear()
                         
                         progress_bar.progress(100)
                         status_text.text("✅ Scraping completed successfully!")
@@ -268,6 +245,105 @@ def show_dashboard():
                     progress_bar.progress(0)
                     status_text.text("")
 
+@st.cache_data(show_spinner=False)
+def clean_numeric(series: pd.Series) -> pd.Series:
+    """Pull the first number out of each value (e.g. '₹1,299', '4.3 out of 5'), dropping non-numeric ones"""
+    return pd.to_numeric(
+        series.astype(str).str.replace(',', '', regex=False).str.extract(NUMBER_PATTERN, expand=False),
+        errors='coerce'
+    ).dropna()
+
+def binned_histogram(values, bins, title, x_title):
+    """Histogram binned server-side so only the bar heights are sent to the browser"""
+    counts, edges = np.histogram(values, bins=bins)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title="Count", bargap=0)
+    return fig
+
+def build_csv_bytes(df):
+    """
+    CSV bytes via Arrow's native writer, falling back to pandas for columns
+    Arrow cannot convert or write (mixed types, nested dicts/lists).
+    Fields are quoted only when needed, as with df.to_csv; booleans are
+    written as true/false rather than True/False.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        buffer = io.BytesIO()
+        pa_csv.write_csv(table, buffer, write_options=CSV_WRITE_OPTIONS)
+        return buffer.getvalue()
+    except pa.ArrowException:
+        return df.to_csv(index=False).encode('utf-8')
+
+def build_excel_bytes(records):
+    """Build an xlsx file from result records using a write-only workbook"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    
+    fieldnames = list(dict.fromkeys(key for record in records for key in record))
+    sheet.append(fieldnames)
+    for record in records:
+        sheet.append([
+            str(value) if isinstance(value, (dict, list)) else value
+            for value in (record.get(key) for key in fieldnames)
+        ])
+    
+    excel_buffer = io.BytesIO()
+    workbook.save(excel_buffer)
+    return excel_buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def prepare_excel_export(results):
+    """Excel bytes for a result set, built once and reused across reruns"""
+    return build_excel_bytes(results)
+
+@st.cache_data(show_spinner=False)
+def prepare_result_exports(results):
+    """Build the results DataFrame plus CSV and Excel bytes once per result set"""
+    df = pd.DataFrame(results)
+    csv_data = build_csv_bytes(df)
+    excel_data = prepare_excel_export(results)
+    return df, csv_data, excel_data
+
+# Stored scrapes never change after saving, so the history caches below key on the
+# scrape id alone; the underscore keeps Streamlit from hashing the full result list
+@st.cache_data(show_spinner=False, max_entries=32)
+def prepare_history_exports(scrape_id, _results):
+    """Build the DataFrame and CSV bytes for a stored scrape; Excel is built on request"""
+    df = pd.DataFrame(_results)
+    return df, build_csv_bytes(df)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def prepare_history_excel(scrape_id, _results):
+    """Excel bytes for a stored scrape, built on first request"""
+    return build_excel_bytes(_results)
+
+def column_or(df, column, default):
+    """A DataFrame column with missing values (or a missing column) filled with default"""
+    if column not in df:
+        return pd.Series(default, index=df.index)
+    return df[column].fillna(default)
+
+def build_scrape_table(scrapes, include_user=False, include_id=False):
+    """Display table for scrape documents, formatted column-wise rather than per row"""
+    if not scrapes:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame(scrapes)
+    prompts = df['prompt']
+    
+    table = pd.DataFrame({'Date': df['created_at'].dt.strftime('%Y-%m-%d %H:%M')})
+    if include_user:
+        table['User'] = column_or(df, 'username', 'Unknown')
+    table['Query'] = prompts.where(prompts.str.len() <= 50, prompts.str[:50] + '...')
+    table['Website'] = column_or(df, 'website', 'N/A')
+    table['Records'] = column_or(df, 'record_count', 0)
+    table['Status'] = df['status'].str.title()
+    if include_id:
+        table['ID'] = df['_id'].astype(str)
+    
+    return table
+
 def display_scraping_results(results, prompt, website):
     """Display scraping results with visualizations and download options"""
     
@@ -278,8 +354,8 @@ def display_scraping_results(results, prompt, website):
     st.markdown("---")
     st.markdown("### 📊 Scraping Results")
     
-    # Convert to DataFrame
-    df = pd.DataFrame(results)
+    # Convert to DataFrame and export formats (cached across reruns)
+    df, csv_data, excel_data = prepare_result_exports(results)
     
     # Results summary
     col1, col2 = st.columns([2, 1])
@@ -291,25 +367,21 @@ def display_scraping_results(results, prompt, website):
     
     with col2:
         st.markdown("**Export Options:**")
+        file_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # CSV download
-        csv_data = df.to_csv(index=False)
         st.download_button(
             "📄 Download CSV",
             csv_data,
-            file_name=f"scraped_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            file_name=f"scraped_data_{file_stamp}.csv",
             mime="text/csv"
         )
         
         # Excel download
-        excel_buffer = io.BytesIO()
-        df.to_excel(excel_buffer, index=False, engine='openpyxl')
-        excel_data = excel_buffer.getvalue()
-        
         st.download_button(
             "📊 Download Excel",
             excel_data,
-            file_name=f"scraped_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            file_name=f"scraped_data_{file_stamp}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
     
@@ -326,31 +398,23 @@ def display_scraping_results(results, prompt, website):
         # Price distribution
         if 'price' in df.columns:
             with viz_col1:
-                try:
-                    # Clean price data
-                    price_data = df['price'].replace('N/A', None).dropna()
-                    price_numeric = pd.to_numeric(price_data.str.replace(',', ''), errors='coerce').dropna()
-                    
-                    if len(price_numeric) > 0:
-                        fig = px.histogram(x=price_numeric, title="Price Distribution", nbins=20)
-                        fig.update_layout(xaxis_title="Price", yaxis_title="Count")
-                        st.plotly_chart(fig, use_container_width=True)
-                except:
+                price_numeric = clean_numeric(df['price'])
+                
+                if len(price_numeric) > 0:
+                    fig = binned_histogram(price_numeric.to_numpy(), 20, "Price Distribution", "Price")
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
                     st.info("Could not generate price chart")
         
         # Rating distribution
         if 'rating' in df.columns:
             with viz_col2:
-                try:
-                    # Clean rating data
-                    rating_data = df['rating'].replace('N/A', None).dropna()
-                    rating_numeric = pd.to_numeric(rating_data.str.replace(r'[^\d.]', '', regex=True), errors='coerce').dropna()
-                    
-                    if len(rating_numeric) > 0:
-                        fig = px.histogram(x=rating_numeric, title="Rating Distribution", nbins=10)
-                        fig.update_layout(xaxis_title="Rating", yaxis_title="Count")
-                        st.plotly_chart(fig, use_container_width=True)
-                except:
+                rating_numeric = clean_numeric(df['rating'])
+                
+                if len(rating_numeric) > 0:
+                    fig = binned_histogram(rating_numeric.to_numpy(), 10, "Rating Distribution", "Rating")
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
                     st.info("Could not generate rating chart")
 
 def show_scrape_history():
@@ -359,67 +423,63 @@ def show_scrape_history():
     
     st.markdown("### 📚 Your Scraping History")
     
-    auth_manager = AuthManager()
-    user_scrapes = auth_manager.get_user_scrapes(st.session_state.user['id'])
+    user_scrapes = load_user_scrapes(st.session_state.user['id'])
     
     if not user_scrapes:
         st.info("No scraping history found. Start your first scrape!")
         return
     
     # Convert to DataFrame for better display
-    history_data = []
-    for scrape in user_scrapes:
-        history_data.append({
-            'Date': scrape['created_at'].strftime('%Y-%m-%d %H:%M'),
-            'Query': scrape['prompt'][:50] + '...' if len(scrape['prompt']) > 50 else scrape['prompt'],
-            'Website': scrape.get('website', 'N/A'),
-            'Records': scrape.get('record_count', 0),
-            'Status': scrape['status'].title(),
-            'ID': str(scrape['_id'])
-        })
-    
-    df_history = pd.DataFrame(history_data)
+    df_history = load_history_table(st.session_state.user['id'])
     st.dataframe(df_history, use_container_width=True)
     
     # Allow viewing individual scrape results
     st.markdown("### 🔍 View Scrape Details")
-    scrape_ids = [str(s['_id']) for s in user_scrapes]
-    selected_id = st.selectbox("Select a scrape to view details:", [''] + scrape_ids)
+    scrapes_by_id = {str(s['_id']): s for s in user_scrapes}
+    selected_id = st.selectbox("Select a scrape to view details:", [''] + list(scrapes_by_id))
     
     if selected_id:
-        selected_scrape = next(s for s in user_scrapes if str(s['_id']) == selected_id)
+        selected_scrape = scrapes_by_id[selected_id]
         
         st.markdown(f"**Query:** {selected_scrape['prompt']}")
         st.markdown(f"**Website:** {selected_scrape.get('website', 'N/A')}")
         st.markdown(f"**Date:** {selected_scrape['created_at']}")
         st.markdown(f"**Status:** {selected_scrape['status'].title()}")
         
-        if selected_scrape.get('results') and selected_scrape['status'] == 'completed':
-            results_df = pd.DataFrame(selected_scrape['results'])
+        results = []
+        if selected_scrape['status'] == 'completed' and selected_scrape.get('record_count'):
+            results = load_scrape_results(st.session_state.user['id'], selected_id)
+        
+        if results:
+            file_stamp = datetime.now().strftime('%Y%m%d')
+            results_df, csv_data = prepare_history_exports(selected_id, results)
             st.dataframe(results_df, use_container_width=True)
             
             # Download options
             col1, col2 = st.columns(2)
             with col1:
-                csv_data = results_df.to_csv(index=False)
                 st.download_button(
                     "📄 Download CSV",
                     csv_data,
-                    file_name=f"scrape_{selected_id}_{datetime.now().strftime('%Y%m%d')}.csv",
+                    file_name=f"scrape_{selected_id}_{file_stamp}.csv",
                     mime="text/csv"
                 )
             
             with col2:
-                excel_buffer = io.BytesIO()
-                results_df.to_excel(excel_buffer, index=False, engine='openpyxl')
-                excel_data = excel_buffer.getvalue()
+                # Excel is the expensive export, so only build it once asked for
+                excel_key = f"excel_ready_{selected_id}"
+                if st.button("📊 Prepare Excel", key=f"prepare_{excel_key}"):
+                    st.session_state[excel_key] = True
                 
-                st.download_button(
-                    "📊 Download Excel",
-                    excel_data,
-                    file_name=f"scrape_{selected_id}_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+                if st.session_state.get(excel_key):
+                    excel_data = prepare_history_excel(selected_id, results)
+                    
+                    st.download_button(
+                        "📊 Download Excel",
+                        excel_data,
+                        file_name=f"scrape_{selected_id}_{file_stamp}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
 
 def show_admin_panel():
     """Admin panel to view all users and their scrapes"""
@@ -427,11 +487,8 @@ def show_admin_panel():
     
     st.markdown("### 👑 Admin Panel")
     
-    auth_manager = AuthManager()
-    
     # Admin stats
-    all_users = auth_manager.get_all_users_admin()
-    all_scrapes = auth_manager.get_all_scrapes_admin()
+    all_users, scrape_stats, recent_scrapes = load_admin_overview()
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -439,79 +496,56 @@ def show_admin_panel():
         st.metric("Total Users", len(all_users))
     
     with col2:
-        st.metric("Total Scrapes", len(all_scrapes))
+        st.metric("Total Scrapes", scrape_stats['total'])
     
     with col3:
-        successful_scrapes = [s for s in all_scrapes if s['status'] == 'completed']
-        success_rate = (len(successful_scrapes) / len(all_scrapes) * 100) if all_scrapes else 0
+        success_rate = (scrape_stats['successes'] / scrape_stats['total'] * 100) if scrape_stats['total'] else 0
         st.metric("Global Success Rate", f"{success_rate:.1f}%")
     
     with col4:
-        total_records = sum(s.get('record_count', 0) for s in all_scrapes)
-        st.metric("Total Records", total_records)
+        st.metric("Total Records", scrape_stats['records'])
     
     # Users table
     st.markdown("### 👥 All Users")
-    users_data = []
-    for user in all_users:
-        user_scrapes = [s for s in all_scrapes if s.get('username') == user['username']]
-        users_data.append({
-            'Username': user['username'],
-            'Email': user['email'],
-            'Role': 'Admin' if user.get('is_admin') else 'User',
-            'Scrapes': len(user_scrapes),
-            'Joined': user['created_at'].strftime('%Y-%m-%d'),
-            'Last Active': user.get('last_login', user['created_at']).strftime('%Y-%m-%d') if user.get('last_login') else user['created_at'].strftime('%Y-%m-%d')
+    users_df = pd.DataFrame()
+    if all_users:
+        users = pd.DataFrame(all_users)
+        created = pd.to_datetime(users['created_at'])
+        last_active = pd.to_datetime(column_or(users, 'last_login', pd.NaT)).fillna(created)
+        
+        users_df = pd.DataFrame({
+            'Username': users['username'],
+            'Email': users['email'],
+            'Role': column_or(users, 'is_admin', False).astype(bool).map({True: 'Admin', False: 'User'}),
+            'Scrapes': users['_id'].astype(str).map(scrape_stats['by_user']).fillna(0).astype(int),
+            'Joined': created.dt.strftime('%Y-%m-%d'),
+            'Last Active': last_active.dt.strftime('%Y-%m-%d')
         })
     
-    users_df = pd.DataFrame(users_data)
     st.dataframe(users_df, use_container_width=True)
     
     # All scrapes table
     st.markdown("### 🕷️ All Scrapes")
-    scrapes_data = []
-    for scrape in all_scrapes[-100:]:  # Show last 100 scrapes
-        scrapes_data.append({
-            'Date': scrape['created_at'].strftime('%Y-%m-%d %H:%M'),
-            'User': scrape.get('username', 'Unknown'),
-            'Query': scrape['prompt'][:50] + '...' if len(scrape['prompt']) > 50 else scrape['prompt'],
-            'Website': scrape.get('website', 'N/A'),
-            'Records': scrape.get('record_count', 0),
-            'Status': scrape['status'].title()
-        })
-    
-    scrapes_df = pd.DataFrame(scrapes_data)
+    scrapes_df = build_scrape_table(recent_scrapes, include_user=True)
     st.dataframe(scrapes_df, use_container_width=True)
     
     # Usage analytics
     st.markdown("### 📈 Usage Analytics")
     
-    if all_scrapes:
+    if scrape_stats['total']:
         # Scrapes over time
-        scrapes_by_date = {}
-        for scrape in all_scrapes:
-            date_key = scrape['created_at'].strftime('%Y-%m-%d')
-            scrapes_by_date[date_key] = scrapes_by_date.get(date_key, 0) + 1
-        
-        dates = sorted(scrapes_by_date.keys())
-        counts = [scrapes_by_date[date] for date in dates]
+        by_date_df = pd.DataFrame(scrape_stats['by_date'], columns=['Date', 'Number of Scrapes'])
         
-        fig = px.line(x=dates, y=counts, title="Scrapes Over Time")
-        fig.update_layout(xaxis_title="Date", yaxis_title="Number of Scrapes")
+        fig = px.line(by_date_df, x='Date', y='Number of Scrapes', title="Scrapes Over Time")
         st.plotly_chart(fig, use_container_width=True)
         
         # Top websites
-        website_counts = {}
-        for scrape in all_scrapes:
-            website = scrape.get('website', 'Unknown')
-            website_counts[website] = website_counts.get(website, 0) + 1
+        top_websites = scrape_stats['top_websites']
         
-        if website_counts:
-            top_websites = sorted(website_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            websites, counts = zip(*top_websites)
+        if top_websites:
+            top_websites_df = pd.DataFrame(top_websites, columns=['Website', 'Scrape Count'])
             
-            fig = px.bar(x=list(websites), y=list(counts), title="Top 10 Scraped Websites")
-            fig.update_layout(xaxis_title="Website", yaxis_title="Scrape Count")
+            fig = px.bar(top_websites_df, x='Website', y='Scrape Count', title="Top 10 Scraped Websites")
             st.plotly_chart(fig, use_container_width=True)
 
 # Main dashboard logic
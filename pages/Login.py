@@ -1,10 +1,9 @@
 import streamlit as st
-from utils.auth_utils import AuthManager, login_user
-from utils.ui_utils import hide_streamlit_sidebar, apply_custom_styling
+from utils.auth_utils import get_auth_manager, login_user
+from utils.ui_utils import apply_page_styling
 
 # Hide sidebar immediately when page loads
-hide_streamlit_sidebar()
-apply_custom_styling()
+apply_page_styling()
 
 def show_login_page():
     """Display login page"""
@@ -50,7 +49,7 @@ def show_login_page():
                     st.error("Please fill in all fields")
                 else:
                     # Authenticate user
-                    auth_manager = AuthManager()
+                    auth_manager = get_auth_manager()
                     
                     with st.spinner("Authenticating..."):
                         result = auth_manager.authenticate_user(username, password)
@@ -90,7 +89,7 @@ def show_login_page():
     
     # Quick setup for demo
     if st.button("🚀 Quick Demo Setup", help="Creates demo accounts automatically"):
-        auth_manager = AuthManager()
+        auth_manager = get_auth_manager()
         
         # Create demo user
         demo_result = auth_manager.create_user("demo_user", "demo@example.com", "demo123")
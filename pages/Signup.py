@@ -1,30 +1,121 @@
 import streamlit as st
 import re
-from utils.auth_utils import AuthManager
-from utils.ui_utils import hide_streamlit_sidebar, apply_custom_styling
+import string
+from utils.auth_utils import get_auth_manager
+from utils.ui_utils import apply_page_styling
+
+# Local part and domain are matched separately with bounded lengths so a
+# malformed address cannot make the engine backtrack across the '@'
+EMAIL_MAX_LENGTH = 254
+EMAIL_LOCAL_PATTERN = re.compile(r'\A[a-zA-Z0-9._%+-]{1,64}\Z')
+EMAIL_DOMAIN_PATTERN = re.compile(r'\A[a-zA-Z0-9.-]{1,253}\.[a-zA-Z]{2,24}\Z')
+PASSWORD_LETTERS = frozenset(string.ascii_letters)
+PASSWORD_DIGITS = frozenset(string.digits)
+
+# Static page copy
+SIGNUP_HEADER_HTML = """
+<div style="text-align: center; padding: 2rem 0;">
+    <h1>📝 Create Your Account</h1>
+    <p>Join the AI Web Scraper platform and start extracting data effortlessly</p>
+</div>
+"""
+
+BENEFITS_CORE_MD = """
+**🚀 Core Features:**
+- Unlimited web scraping
+- AI-powered prompt parsing
+- Stealth mode scraping
+- Multiple export formats
+"""
+
+BENEFITS_DATA_MD = """
+**📊 Data Management:**
+- Scrape history tracking
+- Data visualization charts
+- CSV & Excel downloads
+- Personal dashboard
+"""
+
+SECURITY_NOTICE_MD = """
+🔒 **Your Privacy & Security:** All passwords are encrypted and your data is stored securely.
+"""
 
 # Hide sidebar immediately when page loads
-hide_streamlit_sidebar()
-apply_custom_styling()
+apply_page_styling()
 
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    if len(email) > EMAIL_MAX_LENGTH or email.count('@') != 1:
+        return False
+    
+    local, domain = email.split('@')
+    return (
+        EMAIL_LOCAL_PATTERN.match(local) is not None
+        and EMAIL_DOMAIN_PATTERN.match(domain) is not None
+    )
 
 def validate_password(password):
     """Validate password strength"""
     if len(password) < 6:
         return False, "Password must be at least 6 characters long"
     
-    if not re.search(r'[A-Za-z]', password):
+    if PASSWORD_LETTERS.isdisjoint(password):
         return False, "Password must contain at least one letter"
     
-    if not re.search(r'\d', password):
+    if PASSWORD_DIGITS.isdisjoint(password):
         return False, "Password must contain at least one number"
     
     return True, "Password is valid"
 
+def iter_signup_errors(username, email, password, confirm_password, terms_accepted):
+    """Yield a message for each signup field that fails validation"""
+    if not username or len(username.strip()) < 3:
+        yield "Username must be at least 3 characters long"
+    
+    if not email or not validate_email(email):
+        yield "Please enter a valid email address"
+    
+    if not password:
+        yield "Password is required"
+    else:
+        is_valid, password_msg = validate_password(password)
+        if not is_valid:
+            yield password_msg
+    
+    if password != confirm_password:
+        yield "Passwords do not match"
+    
+    if not terms_accepted:
+        yield "You must accept the Terms of Service"
+
+def submit_signup():
+    """Form callback: validate the submitted fields and create the account before the rerun"""
+    state = st.session_state
+    errors = list(iter_signup_errors(
+        state.signup_username,
+        state.signup_email,
+        state.signup_password,
+        state.signup_confirm_password,
+        state.signup_terms
+    ))
+    
+    if not errors:
+        try:
+            result = get_auth_manager().create_user(
+                state.signup_username.strip(),
+                state.signup_email.strip().lower(),
+                state.signup_password
+            )
+            
+            if result["success"]:
+                state.signup_success = True
+            else:
+                errors.append(result["message"])
+        except Exception as e:
+            errors.append(f"An error occurred while creating your account: {str(e)}")
+    
+    state.signup_errors = errors
+
 def show_signup_page():
     """Display signup page"""
     
@@ -32,12 +123,7 @@ def show_signup_page():
     if 'signup_success' not in st.session_state:
         st.session_state.signup_success = False
     
-    st.markdown("""
-    <div style="text-align: center; padding: 2rem 0;">
-        <h1>📝 Create Your Account</h1>
-        <p>Join the AI Web Scraper platform and start extracting data effortlessly</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(SIGNUP_HEADER_HTML, unsafe_allow_html=True)
     
     # Create centered signup form
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -69,91 +155,55 @@ def show_signup_page():
                     
         else:
             # Show signup form only if not successful
+            # Errors from the last submit, set by submit_signup
+            for error in st.session_state.pop('signup_errors', []):
+                st.error(error)
+            
             with st.form("signup_form", clear_on_submit=True):
                 st.markdown("### Create Your Account")
                 
-                username = st.text_input(
+                st.text_input(
                     "Username",
+                    key="signup_username",
                     placeholder="Choose a unique username",
                     help="This will be your login identifier"
                 )
                 
-                email = st.text_input(
+                st.text_input(
                     "Email Address",
+                    key="signup_email",
                     placeholder="Enter your email address"
                 )
                 
-                password = st.text_input(
+                st.text_input(
                     "Password",
+                    key="signup_password",
                     type="password",
                     placeholder="Create a strong password",
                     help="At least 6 characters with letters and numbers"
                 )
                 
-                confirm_password = st.text_input(
+                st.text_input(
                     "Confirm Password",
+                    key="signup_confirm_password",
                     type="password",
                     placeholder="Re-enter your password"
                 )
                 
                 # Terms and conditions
-                terms_accepted = st.checkbox(
-                    "I agree to the Terms of Service and Privacy Policy"
+                st.checkbox(
+                    "I agree to the Terms of Service and Privacy Policy",
+                    key="signup_terms"
                 )
                 
-                # Submit button
-                submitted = st.form_submit_button(
+                # Submit button; validation and account creation run in the callback,
+                # so a successful signup shows the success state without another rerun
+                st.form_submit_button(
                     "🚀 Create Account",
+                    on_click=submit_signup,
                     use_container_width=True,
                     type="primary"
                 )
-                
-                if submitted:
-                    # Validation checks
-                    errors = []
-                    
-                    if not username or len(username.strip()) < 3:
-                        errors.append("Username must be at least 3 characters long")
-                    
-                    if not email or not validate_email(email):
-                        errors.append("Please enter a valid email address")
-                    
-                    if not password:
-                        errors.append("Password is required")
-                    else:
-                        is_valid, password_msg = validate_password(password)
-                        if not is_valid:
-                            errors.append(password_msg)
-                    
-                    if password != confirm_password:
-                        errors.append("Passwords do not match")
-                    
-                    if not terms_accepted:
-                        errors.append("You must accept the Terms of Service")
-                    
-                    # Display errors or create account
-                    if errors:
-                        for error in errors:
-                            st.error(error)
-                    else:
-                        # Create user account
-                        auth_manager = AuthManager()
-                        
-                        with st.spinner("Creating your account..."):
-                            try:
-                                result = auth_manager.create_user(
-                                    username.strip(),
-                                    email.strip().lower(),
-                                    password
-                                )
-                                
-                                if result["success"]:
-                                    st.session_state.signup_success = True
-                                    st.rerun()  # Rerun to show success state
-                                else:
-                                    st.error(result["message"])
-                            except Exception as e:
-                                st.error(f"An error occurred while creating your account: {str(e)}")
         
         st.markdown("</div>", unsafe_allow_html=True)
     
@@ -181,24 +231,10 @@ def show_signup_page():
         benefits_col1, benefits_col2 = st.columns(2)
         
         with benefits_col1:
-            st.markdown("""
-            **🚀 Core Features:**
-            - Unlimited web scraping
-            - AI-powered prompt parsing
-            - Stealth mode scraping
-            - Multiple export formats
-            """)
+            st.markdown(BENEFITS_CORE_MD)
         
         with benefits_col2:
-            st.markdown("""
-            **📊 Data Management:**
-            - Scrape history tracking
-            - Data visualization charts
-            - CSV & Excel downloads
-            - Personal dashboard
-            """)
+            st.markdown(BENEFITS_DATA_MD)
         
         # Security notice
-        st.info("""
-        🔒 **Your Privacy & Security:** All passwords are encrypted and your data is stored securely.
-        """)
\ No newline at end of file
+        st.info(SECURITY_NOTICE_MD)
\ No newline at end of file
@@ -3,33 +3,12 @@ import sys
 import os
 from utils.auth_utils import check_authentication, init_session_state, logout_user
 
-# Configure page
-st.set_page_config(
-    page_title="AI Web Scraper",
-    page_icon="🕷️",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
-
-# COMPLETE SIDEBAR REMOVAL CSS - Place this immediately after st.set_page_config
-st.markdown("""
+# Sidebar removal plus landing page styling, sent as a single markdown message
+GLOBAL_CSS = """
     <style>
-    /* Hide sidebar completely */
-    section[data-testid="stSidebar"] {
-        display: none !important;
-    }
-    
-    /* Hide sidebar navigation */
-    [data-testid="stSidebarNav"] {
-        display: none !important;
-    }
-    
-    /* Hide collapsed sidebar control */
-    button[data-testid="collapsedControl"] {
-        display: none !important;
-    }
-    
-    /* Hide hamburger menu */
+    /* Hide the sidebar, its navigation and the collapsed-sidebar control */
+    section[data-testid="stSidebar"],
+    [data-testid="stSidebarNav"],
     [data-testid="collapsedControl"] {
         display: none !important;
     }
@@ -41,38 +20,7 @@ st.markdown("""
         max-width: none !important;
     }
     
-    /* Hide any potential sidebar remnants */
-    .css-1d391kg, .css-1lcbmhc, .css-17lntkn, .css-1outpf7 {
-        display: none !important;
-    }
-    
-    /* Additional cleanup for sidebar elements */
-    [data-testid="stSidebar"] > div {
-        display: none !important;
-    }
-    
-    /* Force hide any sidebar with more specific selectors */
-    section[data-testid="stSidebar"], 
-    section[data-testid="stSidebar"] *,
-    .css-1lcbmhc,
-    .css-1d391kg {
-        display: none !important;
-        visibility: hidden !important;
-        opacity: 0 !important;
-        width: 0 !important;
-        height: 0 !important;
-        margin: 0 !important;
-        padding: 0 !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# Initialize session state
-init_session_state()
-
-# Custom CSS for styling
-st.markdown("""
-<style>
+    /* Landing page styling */
     .main-header {
         text-align: center;
         padding: 2rem 0;
@@ -101,47 +49,70 @@ st.markdown("""
         border-radius: 15px;
         margin: 2rem 0;
     }
-</style>
-""", unsafe_allow_html=True)
+    </style>
+"""
+
+# Static landing page markup
+HERO_HTML = """
+<div class="hero-section">
+    <h1>🕷️ AI-Powered Web Scraper</h1>
+    <h3>Scrape any website with natural language prompts</h3>
+    <p>Extract data from JavaScript-heavy sites like Amazon, Flipkart, and Government portals</p>
+</div>
+"""
+
+FEATURE_AI_HTML = """
+<div class="feature-card">
+    <h4>🤖 AI-Powered</h4>
+    <p>Use natural language to describe what you want to scrape. No coding required!</p>
+</div>
+"""
+
+FEATURE_STEALTH_HTML = """
+<div class="feature-card">
+    <h4>🛡️ Stealth Mode</h4>
+    <p>Advanced anti-detection techniques to bypass captchas and rate limiting.</p>
+</div>
+"""
+
+FEATURE_EXPORTS_HTML = """
+<div class="feature-card">
+    <h4>📊 Rich Exports</h4>
+    <p>Get your data as tables, CSV, Excel files, and interactive charts.</p>
+</div>
+"""
+
+# Configure page
+st.set_page_config(
+    page_title="AI Web Scraper",
+    page_icon="🕷️",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# COMPLETE SIDEBAR REMOVAL CSS + app styling - Place this immediately after st.set_page_config
+st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
+
+# Initialize session state
+init_session_state()
 
 def show_landing_page():
     """Show landing page for non-authenticated users"""
     
     # Hero Section
-    st.markdown("""
-    <div class="hero-section">
-        <h1>🕷️ AI-Powered Web Scraper</h1>
-        <h3>Scrape any website with natural language prompts</h3>
-        <p>Extract data from JavaScript-heavy sites like Amazon, Flipkart, and Government portals</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
     
     # Features
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
-        <div class="feature-card">
-            <h4>🤖 AI-Powered</h4>
-            <p>Use natural language to describe what you want to scrape. No coding required!</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(FEATURE_AI_HTML, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
-        <div class="feature-card">
-            <h4>🛡️ Stealth Mode</h4>
-            <p>Advanced anti-detection techniques to bypass captchas and rate limiting.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(FEATURE_STEALTH_HTML, unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
-        <div class="feature-card">
-            <h4>📊 Rich Exports</h4>
-            <p>Get your data as tables, CSV, Excel files, and interactive charts.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(FEATURE_EXPORTS_HTML, unsafe_allow_html=True)
     
     # Example prompts
     st.markdown("### 💡 Example Prompts")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the app packages (pages, utils) and main.py importable from tests
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
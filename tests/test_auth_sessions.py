@@ -0,0 +1,107 @@
+import secrets
+
+import pytest
+
+for module in ("streamlit", "pymongo", "bcrypt", "dotenv"):
+    pytest.importorskip(module)
+
+from pymongo.errors import OperationFailure
+
+from utils.auth_utils import AuthManager
+
+
+class FakeSessions:
+    name = "sessions"
+    
+    def __init__(self, fail_create=1, fail_drop=False):
+        self.fail_create = fail_create
+        self.fail_drop = fail_drop
+        self.ttl_indexes = []
+    
+    def create_index(self, key, **kwargs):
+        if self.fail_create:
+            self.fail_create -= 1
+            raise OperationFailure("Index with name: expires_at_1 already exists with different options")
+        self.ttl_indexes.append((key, kwargs))
+    
+    def drop_index(self, key):
+        if self.fail_drop:
+            raise OperationFailure("not authorized")
+
+
+class FakeDb:
+    def __init__(self, fail_collmod):
+        self.fail_collmod = fail_collmod
+        self.commands = []
+    
+    def command(self, *args, **kwargs):
+        if self.fail_collmod:
+            raise OperationFailure("unknown option to collMod: index")
+        self.commands.append(args)
+
+
+def make_manager(sessions, fail_collmod):
+    manager = object.__new__(AuthManager)
+    manager.sessions_collection = sessions
+    manager.db = FakeDb(fail_collmod)
+    return manager
+
+
+def test_plain_index_is_converted_in_place():
+    manager = make_manager(FakeSessions(), fail_collmod=False)
+    
+    manager._ensure_session_ttl_index()
+    
+    assert manager.db.commands == [("collMod", "sessions")]
+
+
+def test_index_is_rebuilt_when_collmod_is_unsupported():
+    sessions = FakeSessions()
+    manager = make_manager(sessions, fail_collmod=True)
+    
+    manager._ensure_session_ttl_index()
+    
+    assert sessions.ttl_indexes == [("expires_at", {"expireAfterSeconds": 0})]
+
+
+def test_startup_survives_when_no_ttl_index_can_be_made():
+    sessions = FakeSessions(fail_create=2, fail_drop=True)
+    manager = make_manager(sessions, fail_collmod=True)
+    
+    manager._ensure_session_ttl_index()
+    
+    assert sessions.ttl_indexes == []
+
+
+class RecordingSessions:
+    def __init__(self):
+        self.deleted = []
+    
+    def delete_one(self, query):
+        self.deleted.append(query)
+    
+    def aggregate(self, pipeline):
+        raise AssertionError("invalid tokens must not be looked up")
+
+
+@pytest.mark.parametrize("token", [
+    "not base64!",
+    "abc",
+    secrets.token_urlsafe(16),
+    # Characters outside the alphabet would otherwise be dropped while decoding
+    secrets.token_urlsafe(32)[:20] + "!!" + secrets.token_urlsafe(32)[20:],
+])
+def test_malformed_tokens_are_rejected_without_queries(token):
+    manager = object.__new__(AuthManager)
+    manager.sessions_collection = RecordingSessions()
+    
+    assert AuthManager._session_key(token) is None
+    assert manager.verify_session(token) is None
+    assert manager.logout(token) is True
+    assert manager.sessions_collection.deleted == []
+
+
+def test_issued_tokens_round_trip():
+    token = secrets.token_urlsafe(32)
+    
+    assert len(AuthManager._session_key(token)) == 32
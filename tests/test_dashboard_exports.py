@@ -0,0 +1,39 @@
+import csv
+import io
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("streamlit")
+pytest.importorskip("plotly")
+pytest.importorskip("openpyxl")
+pytest.importorskip("pymongo")
+pytest.importorskip("bcrypt")
+
+from pages.Dashboard import build_csv_bytes
+
+
+def read_rows(data):
+    return list(csv.reader(io.StringIO(data.decode("utf-8"))))
+
+
+def test_flat_columns_use_arrow_writer_without_extra_quoting():
+    df = pd.DataFrame({"title": ["Phone", "Laptop, 15in"], "price": [100, 200]})
+
+    data = build_csv_bytes(df)
+
+    assert data.splitlines()[0] == b"title,price"
+    assert read_rows(data) == [["title", "price"], ["Phone", "100"], ["Laptop, 15in", "200"]]
+
+
+@pytest.mark.parametrize("nested", [
+    [{"k": 1}, {"k": 2}],
+    [[1, 2], [3]],
+])
+def test_nested_value_column_falls_back_to_pandas(nested):
+    df = pd.DataFrame({"title": ["a", "b"], "meta": nested})
+
+    data = build_csv_bytes(df)
+
+    assert data == df.to_csv(index=False).encode("utf-8")
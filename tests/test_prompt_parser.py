@@ -0,0 +1,19 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+for module in ("playwright", "fastapi", "redis", "orjson"):
+    pytest.importorskip(module)
+
+from main import ContentType, IntelligentPromptParser
+
+
+@pytest.mark.parametrize("content_type", [ContentType.PRODUCTS, ContentType.JOBS])
+def test_inferred_search_urls_encode_reserved_characters(content_type):
+    websites = IntelligentPromptParser._infer_websites_from_content_type(content_type, 'shirts "m&s"')
+    
+    assert websites
+    for website in websites:
+        query = urlparse(website.url).query
+        assert "&" not in query
+        assert list(parse_qs(query).values()) == [["shirts m&s"]]
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+for module in ("playwright", "fastapi", "redis", "orjson"):
+    pytest.importorskip(module)
+
+from main import WebScrapingAPI
+
+
+class FakePipeline:
+    """Queues sorted-set commands and applies them atomically, like MULTI/EXEC"""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+    
+    async def execute(self):
+        # Yield first so concurrent callers interleave between round trips
+        await asyncio.sleep(0)
+        return [getattr(self.redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.sets = {}
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def zrem(self, key, member):
+        await asyncio.sleep(0)
+        return int(self.sets.get(key, {}).pop(member, None) is not None)
+    
+    def _zremrangebyscore(self, key, low, high):
+        entries = self.sets.setdefault(key, {})
+        stale = [member for member, score in entries.items() if low <= score <= high]
+        for member in stale:
+            del entries[member]
+        return len(stale)
+    
+    def _zadd(self, key, mapping):
+        self.sets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+    
+    def _zcard(self, key):
+        return len(self.sets.get(key, {}))
+    
+    def _zrange(self, key, start, end, withscores=False):
+        ordered = sorted(self.sets.get(key, {}).items(), key=lambda item: item[1])
+        return ordered[start:end + 1]
+    
+    def _expire(self, key, seconds):
+        return True
+
+
+def test_concurrent_requests_cannot_exceed_limit(monkeypatch):
+    monkeypatch.setattr(WebScrapingAPI, "RATE_LIMIT_MAX_REQUESTS", 5)
+    api = object.__new__(WebScrapingAPI)
+    api.redis = FakeRedis()
+    
+    async def burst():
+        return await asyncio.gather(*(api._allow_request("alice") for _ in range(8)))
+    
+    outcomes = asyncio.run(burst())
+    
+    assert sum(allowed for allowed, _ in outcomes) == 5
+    assert all(retry_after >= 1 for allowed, retry_after in outcomes if not allowed)
+    assert len(api.redis.sets["rl:alice"]) == 5
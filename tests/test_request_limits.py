@@ -0,0 +1,34 @@
+import pytest
+
+for module in ("playwright", "fastapi", "redis", "orjson", "httpx"):
+    pytest.importorskip(module)
+
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+def test_chunked_body_is_rejected():
+    def chunks():
+        yield b'{"prompt": "'
+        yield b"x" * (main.MAX_REQUEST_BODY_BYTES + 1)
+        yield b'"}'
+    
+    response = client.post("/scrape", content=chunks(), headers={"content-type": "application/json"})
+    
+    assert response.status_code == 411
+
+
+def test_oversized_body_is_rejected():
+    response = client.post("/scrape", content=b"x" * (main.MAX_REQUEST_BODY_BYTES + 1))
+    
+    assert response.status_code == 413
+
+
+def test_small_body_passes_the_limit():
+    # An unknown route shows the middleware let the request through
+    response = client.post("/not-a-route", json={"prompt": "phones"})
+    
+    assert response.status_code == 404
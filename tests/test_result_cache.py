@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+for module in ("playwright", "fastapi", "redis", "orjson"):
+    pytest.importorskip(module)
+
+from main import ContentType, WebScrapingAPI, WebsiteInfo
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+    
+    async def get(self, key):
+        return self.values.get(key)
+    
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+def make_website():
+    return WebsiteInfo(
+        url="https://www.flipkart.com/search?q=phones",
+        domain="flipkart",
+        site_type="ecommerce",
+        content_type=ContentType.PRODUCTS,
+        complexity="dynamic",
+        requires_js=True,
+        estimated_load_time=10,
+        confidence_score=0.9
+    )
+
+
+def test_output_format_does_not_change_cache_key():
+    website = make_website()
+    base = {"max_items": 20, "include_images": False, "include_links": False}
+    
+    json_key = WebScrapingAPI._result_cache_key(website, dict(base, data_format="json"))
+    csv_key = WebScrapingAPI._result_cache_key(website, dict(base, data_format="csv", retry_failed=True))
+    
+    assert json_key == csv_key
+    assert json_key != WebScrapingAPI._result_cache_key(website, dict(base, max_items=50))
+
+
+def test_cached_rows_keep_datetime_scraped_at():
+    api = object.__new__(WebScrapingAPI)
+    api.redis = FakeRedis()
+    scraped_at = datetime(2026, 1, 2, 3, 4, 5, 678900)
+    
+    async def round_trip():
+        await api._store_cached_result("key", [{"title": "Phone", "scraped_at": scraped_at}])
+        return await api._get_cached_result("key")
+    
+    cached = asyncio.run(round_trip())
+    
+    assert cached["rows"][0]["scraped_at"] == scraped_at
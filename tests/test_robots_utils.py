@@ -0,0 +1,59 @@
+import io
+import urllib.error
+
+import pytest
+
+from utils import robots_utils
+
+
+@pytest.fixture(autouse=True)
+def clear_robots_cache():
+    robots_utils._cached_robots_txt.cache_clear()
+    yield
+    robots_utils._cached_robots_txt.cache_clear()
+
+
+@pytest.fixture
+def robots_server(monkeypatch):
+    """Serve robots.txt with a configurable status and count the fetches"""
+    state = {"status": 200, "body": b"User-agent: *\nDisallow: /private\n", "fetches": 0}
+    
+    def fake_urlopen(url, *args, **kwargs):
+        state["fetches"] += 1
+        if state["status"] != 200:
+            raise urllib.error.HTTPError(url, state["status"], "error", {}, io.BytesIO(b""))
+        return io.BytesIO(state["body"])
+    
+    monkeypatch.setattr(robots_utils.urllib.request, "urlopen", fake_urlopen)
+    return state
+
+
+def test_rules_are_parsed_and_cached(robots_server):
+    assert robots_utils.is_allowed_to_scrape("bot", "https://example.com/items")
+    assert not robots_utils.is_allowed_to_scrape("bot", "https://example.com/private/page")
+    assert robots_server["fetches"] == 1
+
+
+def test_server_error_denies_once_and_is_not_cached(robots_server):
+    robots_server["status"] = 503
+    
+    assert not robots_utils.is_allowed_to_scrape("bot", "https://example.com/items")
+    assert robots_utils._cached_robots_txt.cache_info().currsize == 0
+    
+    robots_server["status"] = 200
+    assert robots_utils.is_allowed_to_scrape("bot", "https://example.com/items")
+    assert robots_server["fetches"] == 2
+
+
+def test_read_robots_txt_raises_on_server_error(robots_server):
+    robots_server["status"] = 500
+    
+    with pytest.raises(robots_utils.RobotsTxtUnavailable):
+        robots_utils.read_robots_txt("https://example.com")
+
+
+@pytest.mark.parametrize("status, allowed", [(404, True), (403, False)])
+def test_client_errors_keep_robotparser_semantics(robots_server, status, allowed):
+    robots_server["status"] = status
+    
+    assert robots_utils.is_allowed_to_scrape("bot", "https://example.com/items") is allowed
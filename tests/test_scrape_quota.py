@@ -0,0 +1,114 @@
+import orjson
+import pytest
+
+pytest.importorskip("streamlit")
+requests = pytest.importorskip("requests")
+
+from utils import scraper_utils
+
+
+class SessionState(dict):
+    __getattr__ = dict.get
+    
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+class FakeStreamlit:
+    """Records messages instead of rendering them"""
+    
+    def __init__(self):
+        self.session_state = SessionState(user={"username": "alice", "is_admin": False})
+        self.messages = []
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.messages.append((name, args))
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = orjson.dumps(body)
+
+
+class FakeSession:
+    def __init__(self, outcome):
+        self.outcome = outcome
+    
+    def post(self, *args, **kwargs):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+@pytest.fixture
+def quota(tmp_path, monkeypatch):
+    """Isolated buckets and ledger with the backend reported healthy"""
+    monkeypatch.setattr(scraper_utils, "st", FakeStreamlit())
+    monkeypatch.setattr(scraper_utils, "SCRAPE_LOG_DIR", tmp_path)
+    monkeypatch.setattr(scraper_utils, "SCRAPE_CACHE_DIR", tmp_path / "scrape_cache")
+    monkeypatch.setattr(scraper_utils, "_scrape_buckets", {})
+    monkeypatch.setattr(scraper_utils, "_scrape_buckets_loaded", True)
+    monkeypatch.setattr(scraper_utils, "check_backend_health", lambda: True)
+    
+    def run(outcome):
+        monkeypatch.setattr(scraper_utils, "get_backend_session", lambda: FakeSession(outcome))
+        return scraper_utils.scrape_data("get 10 phones from flipkart")
+    
+    return run
+
+
+def tokens_left():
+    tokens, _ = scraper_utils._scrape_buckets["alice"]
+    return tokens
+
+
+def ledger_entries():
+    lines = []
+    for ledger in scraper_utils.SCRAPE_LOG_DIR.glob("scrape_log-*.jsonl"):
+        lines.extend(orjson.loads(line) for line in ledger.read_bytes().splitlines())
+    return lines
+
+
+def test_successful_scrape_spends_token_and_records_it(quota):
+    body = {"success": True, "results": [{"title": "Phone"}], "website": "flipkart"}
+    
+    results, website = quota(FakeResponse(200, body))
+    
+    assert results == [{"title": "Phone"}]
+    assert tokens_left() == pytest.approx(scraper_utils.DAILY_SCRAPE_LIMIT - 1, abs=0.01)
+    assert [entry["u"] for entry in ledger_entries()] == ["alice"]
+
+
+@pytest.mark.parametrize("status, expected", [(500, "server_error"), (503, "http_error")])
+def test_server_errors_return_the_token(quota, status, expected):
+    _, code = quota(FakeResponse(status, {"detail": "boom"}))
+    
+    assert code == expected
+    assert tokens_left() == pytest.approx(scraper_utils.DAILY_SCRAPE_LIMIT, abs=0.01)
+    assert ledger_entries() == []
+
+
+def test_read_timeout_spends_token(quota):
+    _, code = quota(requests.ReadTimeout())
+    
+    assert code == "timeout"
+    assert tokens_left() == pytest.approx(scraper_utils.DAILY_SCRAPE_LIMIT - 1, abs=0.01)
+    assert [entry["u"] for entry in ledger_entries()] == ["alice"]
+
+
+def test_connection_failure_returns_the_token(quota):
+    _, code = quota(requests.ConnectionError())
+    
+    assert code == "connection_error"
+    assert tokens_left() == pytest.approx(scraper_utils.DAILY_SCRAPE_LIMIT, abs=0.01)
+    assert ledger_entries() == []
+
+
+def test_exhausted_bucket_rejects_without_calling_backend(quota):
+    scraper_utils._scrape_buckets["alice"] = (0.0, scraper_utils.time.time())
+    
+    _, code = quota(AssertionError("backend must not be called"))
+    
+    assert code == "limit_exceeded"
+    assert ledger_entries() == []
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+
+for module in ("streamlit", "pymongo", "bcrypt", "dotenv"):
+    pytest.importorskip(module)
+
+from utils import auth_utils
+from utils.auth_utils import AuthManager
+
+
+class FakeCollection:
+    def __init__(self, fail_inserts=False):
+        self.docs = []
+        self.fail_inserts = fail_inserts
+    
+    def insert_one(self, doc):
+        doc = dict(doc, _id=len(self.docs) + 1)
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+    
+    def insert_many(self, docs, ordered=True):
+        # Simulate an unordered bulk write that stored the first row only
+        self.docs.append(docs[0])
+        if self.fail_inserts:
+            raise RuntimeError("bulk write failed")
+    
+    def delete_one(self, query):
+        self.docs = [doc for doc in self.docs if doc.get("_id") != query["_id"]]
+    
+    def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if doc.get("scrape_id") != query["scrape_id"]]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(auth_utils.st, "error", lambda *args, **kwargs: None)
+    manager = object.__new__(AuthManager)
+    manager.scrapes_collection = FakeCollection()
+    return manager
+
+
+def test_rows_are_stored_with_their_scrape(manager):
+    manager.scrape_rows_collection = FakeCollection()
+    
+    scrape_id = manager.save_scrape_result("u1", "get phones", "flipkart", [{"title": "Phone"}])
+    
+    assert scrape_id == "1"
+    assert [row["scrape_id"] for row in manager.scrape_rows_collection.docs] == [1]
+
+
+def test_failed_row_insert_removes_scrape_and_partial_rows(manager):
+    manager.scrape_rows_collection = FakeCollection(fail_inserts=True)
+    
+    scrape_id = manager.save_scrape_result("u1", "get phones", "flipkart", [{"title": "a"}, {"title": "b"}])
+    
+    assert scrape_id == ""
+    assert manager.scrapes_collection.docs == []
+    assert manager.scrape_rows_collection.docs == []
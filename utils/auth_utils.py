@@ -1,13 +1,73 @@
 import bcrypt
 import streamlit as st
+from bson import Binary, ObjectId
+from bson.errors import InvalidId
 from pymongo import MongoClient
+from pymongo.errors import DuplicateKeyError, OperationFailure
 from datetime import datetime, timedelta
 import os
 from typing import Optional, Dict, List
 import secrets
+import base64
+import binascii
+import time
 from dotenv import load_dotenv
+import logging
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# bcrypt work factor for new hashes; existing hashes keep the cost they were created with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Random bytes per session token (43 urlsafe base64 characters)
+SESSION_TOKEN_BYTES = 32
+
+# Checked against when the username does not exist, so unknown users cost
+# the same bcrypt time as wrong passwords
+DUMMY_PASSWORD_HASH = bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+
+# Per-scrape stages of the admin listing, applied after the page is cut:
+# drop result rows, join the owner's username and stringify ids
+ADMIN_SCRAPE_SUMMARY_STAGES = (
+    {
+        # Drop the stored result rows before the join; only summary fields are shown
+        "$project": {"results": 0}
+    },
+    {
+        # Scrapes store user_id as a string, users are keyed by ObjectId
+        "$addFields": {
+            "user_oid": {
+                "$convert": {"input": "$user_id", "to": "objectId", "onError": None, "onNull": None}
+            }
+        }
+    },
+    {
+        "$lookup": {
+            "from": "users",
+            "localField": "user_oid",
+            "foreignField": "_id",
+            "as": "user"
+        }
+    },
+    {
+        "$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}
+    },
+    {
+        "$project": {
+            "prompt": 1,
+            "website": 1,
+            "status": 1,
+            "created_at": 1,
+            "record_count": 1,
+            "username": "$user.username"
+        }
+    },
+    {
+        "$addFields": {"_id": {"$toString": "$_id"}}
+    }
+)
+
 class AuthManager:
     def __init__(self):
         # MongoDB connection
@@ -26,16 +86,65 @@ class AuthManager:
         self.users_collection = self.db.users
         self.sessions_collection = self.db.sessions
         self.scrapes_collection = self.db.scrapes
+        self.scrape_rows_collection = self.db.scrape_rows
         
         # Create indexes
         self.users_collection.create_index("username", unique=True)
         self.users_collection.create_index("email", unique=True)
         self.sessions_collection.create_index("session_token", unique=True)
-        self.sessions_collection.create_index("expires_at")
+        self.sessions_collection.create_index("user_id")
+        self._ensure_session_ttl_index()
+        self.scrapes_collection.create_index([("user_id", 1), ("created_at", -1)])
+        self.scrapes_collection.create_index([("created_at", -1)])
+        self.scrape_rows_collection.create_index([("scrape_id", 1), ("position", 1)])
+    
+    def _ensure_session_ttl_index(self):
+        """Let MongoDB purge sessions once expires_at passes"""
+        try:
+            self.sessions_collection.create_index("expires_at", expireAfterSeconds=0)
+            return
+        except OperationFailure:
+            pass
+        
+        # Older deployments have a plain expires_at index; convert it in place
+        # (needs MongoDB 5.1+), else rebuild it. Expired sessions are still
+        # filtered on expires_at, so failing both only costs the automatic purge
+        try:
+            self.db.command(
+                "collMod",
+                self.sessions_collection.name,
+                index={"keyPattern": {"expires_at": 1}, "expireAfterSeconds": 0}
+            )
+            return
+        except OperationFailure as e:
+            logger.warning("Could not convert the sessions expires_at index to TTL: %s", e)
+        
+        try:
+            self.sessions_collection.drop_index([("expires_at", 1)])
+            self.sessions_collection.create_index("expires_at", expireAfterSeconds=0)
+        except OperationFailure as e:
+            logger.warning("Could not rebuild the sessions TTL index, expired sessions will not be purged: %s", e)
+    
+    @staticmethod
+    def _session_key(session_token: str) -> Optional[Binary]:
+        """
+        Raw token bytes as stored in MongoDB (32 bytes instead of a 43-char string),
+        or None for tokens that are not urlsafe base64 of SESSION_TOKEN_BYTES bytes
+        """
+        try:
+            raw = base64.urlsafe_b64decode(session_token + "=" * (-len(session_token) % 4))
+        except (binascii.Error, ValueError):
+            return None
+        
+        # The decoder silently skips characters outside the alphabet, so only
+        # accept tokens that re-encode to exactly themselves
+        if len(raw) != SESSION_TOKEN_BYTES or base64.urlsafe_b64encode(raw).rstrip(b"=") != session_token.encode():
+            return None
+        return Binary(raw)
     
     def hash_password(self, password: str) -> str:
         """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
     
     def verify_password(self, password: str, hashed: str) -> bool:
         """Verify password against hash"""
@@ -44,10 +153,6 @@ class AuthManager:
     def create_user(self, username: str, email: str, password: str, is_admin: bool = False) -> Dict:
         """Create new user"""
         try:
-            # Check if user exists
-            if self.users_collection.find_one({"$or": [{"username": username}, {"email": email}]}):
-                return {"success": False, "message": "Username or email already exists"}
-            
             # Create user document
             user_doc = {
                 "username": username,
@@ -55,44 +160,51 @@ class AuthManager:
                 "password_hash": self.hash_password(password),
                 "is_admin": is_admin,
                 "created_at": datetime.utcnow(),
-                "last_login": None,
-                "total_scrapes": 0
+                "last_login": None
             }
             
+            # username and email are uniquely indexed, so the insert itself rejects duplicates
             result = self.users_collection.insert_one(user_doc)
             return {
                 "success": True, 
                 "message": "User created successfully",
                 "user_id": str(result.inserted_id)
             }
+        except DuplicateKeyError:
+            return {"success": False, "message": "Username or email already exists"}
         except Exception as e:
             return {"success": False, "message": f"Error creating user: {str(e)}"}
     
     def authenticate_user(self, username: str, password: str) -> Dict:
         """Authenticate user and create session"""
         try:
-            user = self.users_collection.find_one({"username": username})
+            user = self.users_collection.find_one(
+                {"username": username},
+                {"username": 1, "email": 1, "password_hash": 1, "is_admin": 1}
+            )
             if not user:
+                self.verify_password(password, DUMMY_PASSWORD_HASH)
                 return {"success": False, "message": "Invalid username or password"}
             
             if not self.verify_password(password, user["password_hash"]):
                 return {"success": False, "message": "Invalid username or password"}
             
+            now = datetime.utcnow()
+            
             # Update last login
             self.users_collection.update_one(
                 {"_id": user["_id"]},
-                {"$set": {"last_login": datetime.utcnow()}}
+                {"$set": {"last_login": now}}
             )
             
             # Create session
-            session_token = secrets.token_urlsafe(32)
-            expires_at = datetime.utcnow() + timedelta(hours=24)
+            session_token = secrets.token_urlsafe(SESSION_TOKEN_BYTES)
             
             session_doc = {
                 "user_id": user["_id"],
-                "session_token": session_token,
-                "expires_at": expires_at,
-                "created_at": datetime.utcnow()
+                "session_token": self._session_key(session_token),
+                "expires_at": now + timedelta(hours=24),
+                "created_at": now
             }
             
             self.sessions_collection.insert_one(session_doc)
@@ -114,15 +226,41 @@ class AuthManager:
     def verify_session(self, session_token: str) -> Optional[Dict]:
         """Verify session token and return user info"""
         try:
-            session = self.sessions_collection.find_one({
-                "session_token": session_token,
-                "expires_at": {"$gt": datetime.utcnow()}
-            })
-            
-            if not session:
+            session_key = self._session_key(session_token)
+            if session_key is None:
                 return None
             
-            user = self.users_collection.find_one({"_id": session["user_id"]})
+            # Session and user in one round trip
+            pipeline = [
+                {
+                    "$match": {
+                        "session_token": session_key,
+                        "expires_at": {"$gt": datetime.utcnow()}
+                    }
+                },
+                {
+                    "$limit": 1
+                },
+                {
+                    "$lookup": {
+                        "from": "users",
+                        "localField": "user_id",
+                        "foreignField": "_id",
+                        "as": "user"
+                    }
+                },
+                {
+                    "$unwind": "$user"
+                },
+                {
+                    "$replaceRoot": {"newRoot": "$user"}
+                },
+                {
+                    "$project": {"username": 1, "email": 1, "is_admin": 1}
+                }
+            ]
+            
+            user = next(self.sessions_collection.aggregate(pipeline), None)
             if not user:
                 return None
             
@@ -139,35 +277,97 @@ class AuthManager:
     def logout(self, session_token: str) -> bool:
         """Delete session token"""
         try:
-            self.sessions_collection.delete_one({"session_token": session_token})
+            session_key = self._session_key(session_token)
+            if session_key is None:
+                # Never issued by us, so there is no session to delete
+                return True
+            
+            self.sessions_collection.delete_one({"session_token": session_key})
             return True
         except:
             return False
     
-    def get_user_scrapes(self, user_id: str) -> List[Dict]:
-        """Get all scrapes for a user"""
+    def get_user_scrapes(self, user_id: str, limit: int = 0, skip: int = 0) -> List[Dict]:
+        """Get scrapes for a user, newest first (limit=0 returns all)"""
         try:
-            scrapes = list(self.scrapes_collection.find(
-                {"user_id": user_id}
-            ).sort("created_at", -1))
-            
-            for scrape in scrapes:
-                scrape["_id"] = str(scrape["_id"])
+            pipeline = [
+                {"$match": {"user_id": user_id}},
+                {"$sort": {"created_at": -1}},
+                {"$skip": skip}
+            ]
+            if limit:
+                pipeline.append({"$limit": limit})
+            # Result rows can be large; fetch them per scrape with get_scrape_results
+            pipeline.append({"$project": {"results": 0}})
+            pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
             
-            return scrapes
+            return list(self.scrapes_collection.aggregate(pipeline))
         except Exception as e:
             st.error(f"Error fetching scrapes: {str(e)}")
             return []
     
+    def get_scrape_results(self, user_id: str, scrape_id: str) -> List[Dict]:
+        """Get the stored result rows of one of a user's scrapes"""
+        try:
+            scrape = self.scrapes_collection.find_one(
+                {"_id": ObjectId(scrape_id), "user_id": user_id},
+                {"results": 1}
+            )
+            if not scrape:
+                return []
+            
+            # Scrapes saved before rows moved to scrape_rows embed them directly
+            if "results" in scrape:
+                return scrape["results"]
+            
+            rows = self.scrape_rows_collection.find(
+                {"scrape_id": scrape["_id"]},
+                {"data": 1, "_id": 0}
+            ).sort("position", 1)
+            return [row["data"] for row in rows]
+        except InvalidId:
+            return []
+        except Exception as e:
+            st.error(f"Error fetching scrape results: {str(e)}")
+            return []
+    
+    def get_user_stats(self, user_id: str) -> Dict:
+        """Get dashboard totals for a user in a single aggregation"""
+        stats = {"total": 0, "recent": 0, "successes": 0, "records": 0}
+        try:
+            week_ago = datetime.utcnow() - timedelta(days=7)
+            pipeline = [
+                {"$match": {"user_id": user_id}},
+                {
+                    "$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "recent": {"$sum": {"$cond": [{"$gt": ["$created_at", week_ago]}, 1, 0]}},
+                        "successes": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+                        "records": {"$sum": {"$ifNull": ["$record_count", 0]}}
+                    }
+                }
+            ]
+            
+            for result in self.scrapes_collection.aggregate(pipeline):
+                result.pop("_id")
+                stats.update(result)
+            
+            return stats
+        except Exception as e:
+            st.error(f"Error fetching scrape stats: {str(e)}")
+            return stats
+    
     def save_scrape_result(self, user_id: str, prompt: str, website: str, 
                           results: List[Dict], status: str = "completed") -> str:
         """Save scrape result to database"""
         try:
+            # Rows live in scrape_rows so scrape documents stay small and
+            # large result sets never approach the 16 MB document limit
             scrape_doc = {
                 "user_id": user_id,
                 "prompt": prompt,
                 "website": website,
-                "results": results,
                 "status": status,
                 "created_at": datetime.utcnow(),
                 "record_count": len(results)
@@ -175,11 +375,20 @@ class AuthManager:
             
             result = self.scrapes_collection.insert_one(scrape_doc)
             
-            # Update user's total scrapes
-            self.users_collection.update_one(
-                {"_id": user_id},
-                {"$inc": {"total_scrapes": 1}}
-            )
+            if results:
+                try:
+                    self.scrape_rows_collection.insert_many(
+                        [
+                            {"scrape_id": result.inserted_id, "position": position, "data": row}
+                            for position, row in enumerate(results)
+                        ],
+                        ordered=False
+                    )
+                except Exception:
+                    # Don't leave a scrape document (or partial rows) without its results
+                    self.scrape_rows_collection.delete_many({"scrape_id": result.inserted_id})
+                    self.scrapes_collection.delete_one({"_id": result.inserted_id})
+                    raise
             
             return str(result.inserted_id)
         except Exception as e:
@@ -189,60 +398,126 @@ class AuthManager:
     def get_all_users_admin(self) -> List[Dict]:
         """Get all users (admin only)"""
         try:
-            users = list(self.users_collection.find(
-                {},
-                {"password_hash": 0}  # Exclude password hash
-            ).sort("created_at", -1))
-            
-            for user in users:
-                user["_id"] = str(user["_id"])
+            pipeline = [
+                {"$sort": {"created_at": -1}},
+                {
+                    "$project": {
+                        "_id": {"$toString": "$_id"},
+                        "username": 1,
+                        "email": 1,
+                        "is_admin": 1,
+                        "created_at": 1,
+                        "last_login": 1
+                    }
+                }
+            ]
             
-            return users
+            return list(self.users_collection.aggregate(pipeline))
         except Exception as e:
             st.error(f"Error fetching users: {str(e)}")
             return []
     
-    def get_all_scrapes_admin(self) -> List[Dict]:
-        """Get all scrapes (admin only)"""
+    def get_all_scrapes_admin(self, limit: int = 100, skip: int = 0,
+                              before: Optional[datetime] = None) -> List[Dict]:
+        """Get a page of scrapes across all users, newest first (admin only)
+        
+        Pass the created_at of the last scrape on a page as `before` to fetch the
+        next page by index range instead of skipping over earlier documents.
+        """
         try:
-            pipeline = [
+            pipeline = []
+            if before is not None:
+                pipeline.append({"$match": {"created_at": {"$lt": before}}})
+            pipeline += [
                 {
-                    "$lookup": {
-                        "from": "users",
-                        "localField": "user_id",
-                        "foreignField": "_id",
-                        "as": "user"
-                    }
+                    "$sort": {"created_at": -1}
                 },
                 {
-                    "$unwind": "$user"
+                    "$skip": skip
                 },
                 {
-                    "$project": {
-                        "prompt": 1,
-                        "website": 1,
-                        "status": 1,
-                        "created_at": 1,
-                        "record_count": 1,
-                        "username": "$user.username"
-                    }
+                    "$limit": limit
                 },
+                *ADMIN_SCRAPE_SUMMARY_STAGES
+            ]
+            
+            return list(self.scrapes_collection.aggregate(pipeline))
+        except Exception as e:
+            st.error(f"Error fetching all scrapes: {str(e)}")
+            return []
+    
+    def get_scrape_stats_admin(self) -> Dict:
+        """Get global scrape totals and usage breakdowns in one aggregation (admin only)"""
+        stats = {
+            "total": 0,
+            "successes": 0,
+            "records": 0,
+            "by_user": {},
+            "by_date": [],
+            "top_websites": []
+        }
+        try:
+            pipeline = [
                 {
-                    "$sort": {"created_at": -1}
+                    "$facet": {
+                        "totals": [
+                            {
+                                "$group": {
+                                    "_id": None,
+                                    "total": {"$sum": 1},
+                                    "successes": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+                                    "records": {"$sum": {"$ifNull": ["$record_count", 0]}}
+                                }
+                            }
+                        ],
+                        "by_user": [
+                            {"$group": {"_id": "$user_id", "count": {"$sum": 1}}}
+                        ],
+                        "by_date": [
+                            {
+                                "$group": {
+                                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                                    "count": {"$sum": 1}
+                                }
+                            },
+                            {"$sort": {"_id": 1}}
+                        ],
+                        "top_websites": [
+                            {"$group": {"_id": {"$ifNull": ["$website", "Unknown"]}, "count": {"$sum": 1}}},
+                            {"$sort": {"count": -1}},
+                            {"$limit": 10}
+                        ]
+                    }
                 }
             ]
             
-            scrapes = list(self.scrapes_collection.aggregate(pipeline))
+            result = next(self.scrapes_collection.aggregate(pipeline))
+            
+            if result["totals"]:
+                totals = result["totals"][0]
+                stats["total"] = totals["total"]
+                stats["successes"] = totals["successes"]
+                stats["records"] = totals["records"]
             
-            for scrape in scrapes:
-                scrape["_id"] = str(scrape["_id"])
+            stats["by_user"] = {str(row["_id"]): row["count"] for row in result["by_user"]}
+            stats["by_date"] = [(row["_id"], row["count"]) for row in result["by_date"]]
+            stats["top_websites"] = [(row["_id"], row["count"]) for row in result["top_websites"]]
             
-            return scrapes
+            return stats
         except Exception as e:
-            st.error(f"Error fetching all scrapes: {str(e)}")
-            return []
+            st.error(f"Error fetching scrape stats: {str(e)}")
+            return stats
+
+@st.cache_resource
+def get_auth_manager() -> AuthManager:
+    """Shared AuthManager so reruns and sessions reuse one MongoDB client"""
+    return AuthManager()
 
 # Session state management functions
+# How long a verified session token is trusted before hitting MongoDB again;
+# main(), require_auth() and require_admin() all check on every rerun
+SESSION_RECHECK_SECONDS = 60
+
 def init_session_state():
     """Initialize session state variables"""
     if 'authenticated' not in st.session_state:
@@ -251,23 +526,31 @@ def init_session_state():
         st.session_state.user = None
     if 'session_token' not in st.session_state:
         st.session_state.session_token = None
+    if 'session_checked_at' not in st.session_state:
+        st.session_state.session_checked_at = 0.0
 
 def check_authentication():
     """Check if user is authenticated"""
     init_session_state()
     
     if st.session_state.authenticated and st.session_state.session_token:
-        auth_manager = AuthManager()
+        now = time.monotonic()
+        if st.session_state.user and now - st.session_state.session_checked_at < SESSION_RECHECK_SECONDS:
+            return True
+        
+        auth_manager = get_auth_manager()
         user = auth_manager.verify_session(st.session_state.session_token)
         
         if user:
             st.session_state.user = user
+            st.session_state.session_checked_at = now
             return True
         else:
             # Session expired
             st.session_state.authenticated = False
             st.session_state.user = None
             st.session_state.session_token = None
+            st.session_state.session_checked_at = 0.0
             return False
     
     return False
@@ -282,12 +565,13 @@ def login_user(auth_result: Dict):
 def logout_user():
     """Log out current user"""
     if st.session_state.get("session_token"):
-        auth_manager = AuthManager()
+        auth_manager = get_auth_manager()
         auth_manager.logout(st.session_state.session_token)
     
     st.session_state.authenticated = False
     st.session_state.user = None
     st.session_state.session_token = None
+    st.session_state.session_checked_at = 0.0
 
 def require_auth():
     """Decorator to require authentication"""
@@ -1,15 +1,61 @@
 
 import urllib.robotparser
-import urllib.robotparser
+import time
+from functools import lru_cache
 from urllib.parse import urlparse
 
-def is_allowed_to_scrape(user_agent: str, target_url: str) -> bool:
+# Parsed robots.txt files are reused for this long (in fixed time buckets)
+ROBOTS_CACHE_TTL_SECONDS = 60 * 60 * 6
+
+class RobotsTxtUnavailable(Exception):
+    """robots.txt could not be fetched (e.g. a 5xx), so no rules are known"""
+
+def read_robots_txt(base_url: str) -> urllib.robotparser.RobotFileParser:
+    """
+    Fetch and parse robots.txt for a site
+    
+    Args:
+        base_url: Scheme and host of the site, e.g. https://example.com
+        
+    Returns:
+        RobotFileParser: Parsed robots.txt rules for the host
+        
+    Raises:
+        RobotsTxtUnavailable: The server answered with an error other than
+            401/403 (disallow all) or another 4xx (allow all)
+    """
+    rp = urllib.robotparser.RobotFileParser()
+    rp.set_url(f"{base_url}/robots.txt")
+    rp.read()
+    
+    # read() swallows HTTP errors; on a 5xx it sets no flags and never parses,
+    # leaving a parser whose can_fetch() denies everything
+    if not rp.last_checked and not rp.allow_all and not rp.disallow_all:
+        raise RobotsTxtUnavailable(f"Could not fetch {base_url}/robots.txt")
+    return rp
+
+@lru_cache(maxsize=256)
+def _cached_robots_txt(base_url: str, bucket: int) -> urllib.robotparser.RobotFileParser:
+    return read_robots_txt(base_url)
+
+def load_cached_robots_txt(base_url: str) -> urllib.robotparser.RobotFileParser:
+    """
+    Parsed robots.txt for a site, cached per process
+    
+    Network errors and server errors (RobotsTxtUnavailable) raise, so
+    nothing is cached for them and the next check fetches again.
+    """
+    return _cached_robots_txt(base_url, int(time.time() // ROBOTS_CACHE_TTL_SECONDS))
+
+def is_allowed_to_scrape(user_agent: str, target_url: str, load_rules=load_cached_robots_txt) -> bool:
     """
     Check if scraping is allowed according to robots.txt
     
     Args:
         user_agent: User agent string for the scraper
         target_url: URL to check for scraping permission
+        load_rules: Callable returning the parsed robots.txt for a base URL;
+            defaults to the per-process cache
         
     Returns:
         bool: True if scraping is allowed, False otherwise
@@ -18,9 +64,7 @@ def is_allowed_to_scrape(user_agent: str, target_url: str) -> bool:
         parsed_url = urlparse(target_url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
-        rp = urllib.robotparser.RobotFileParser()
-        rp.set_url(f"{base_url}/robots.txt")
-        rp.read()
+        rp = load_rules(base_url)
         
         return rp.can_fetch(user_agent, target_url)
     except Exception as e:
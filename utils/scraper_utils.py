@@ -1,97 +1,309 @@
-import json
+import orjson
 import os
+import re
+import math
+import hashlib
+import tempfile
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Tuple
-from urllib.parse import urlparse
+from typing import List, Dict, Optional, Tuple
 
 
 # Configuration - Update this with your actual FastAPI backend URL
 BACKEND_URL = os.getenv("SCRAPER_BACKEND_URL", "http://localhost:8000")
 
+# Show backend request/response diagnostics in the UI
+SCRAPER_DEBUG = os.getenv("SCRAPER_DEBUG") == "1"
 
-def check_and_update_scrape_limit(username: str, is_admin: bool = False) -> bool:
+# Keep-alive pool for backend calls; every Streamlit session shares it
+BACKEND_POOL_CONNECTIONS = 4
+BACKEND_POOL_MAXSIZE = 16
+
+# Gateway errors meaning the backend never handled the request, retried with
+# backoff; 504 is excluded since the scrape may have run
+BACKEND_RETRY_STATUSES = (502, 503)
+
+# Responses at or above this status (server errors, including the 502/503
+# gateway errors above) return the user's scrape token instead of spending it
+UNCHARGED_STATUS_FLOOR = 500
+
+# How long a successful /health probe is trusted before probing again
+BACKEND_HEALTH_TTL_SECONDS = 10
+
+# Scrape quota for non-admin users: a token bucket holding DAILY_SCRAPE_LIMIT
+# tokens that refills evenly over a day, rebuilt from append-only JSONL ledgers
+DAILY_SCRAPE_LIMIT = 5
+SCRAPE_REFILL_PER_SECOND = DAILY_SCRAPE_LIMIT / 86400
+SCRAPE_LOG_DIR = Path("data")
+SCRAPE_LOG_RETENTION_DAYS = 30
+
+# Per-user (tokens, updated_at) buckets, shared by all sessions in this process
+_scrape_buckets: Dict[str, Tuple[float, float]] = {}
+_scrape_buckets_loaded = False
+_scrape_log_purged_day: Optional[str] = None
+_scrape_buckets_lock = threading.Lock()
+
+# Items requested from the backend per scrape
+DEFAULT_MAX_ITEMS = 50
+
+# First standalone number in a prompt, read as the requested item count
+ITEM_COUNT_PATTERN = re.compile(r'\b(\d+)\b')
+
+# Sites whose scrapes take noticeably longer, for time estimates
+SLOW_SITE_KEYWORDS = ('flipkart', 'amazon')
+
+# Prompts mentioning any of these are rejected by validate_scraping_prompt
+HARMFUL_KEYWORDS = (
+    'hack', 'attack', 'exploit', 'password', 'credential',
+    'private', 'personal', 'confidential', 'bank', 'payment',
+    'login', 'admin', 'root', 'database'
+)
+
+# All harmful keywords in one pass; whole words (plurals included), so
+# "hackathon" or "bankruptcy" are not rejected
+HARMFUL_KEYWORD_PATTERN = re.compile(
+    r'\b(' + '|'.join(map(re.escape, HARMFUL_KEYWORDS)) + r')s?\b',
+    re.IGNORECASE
+)
+
+# Successful scrapes are reused for repeat prompts on the same day
+SCRAPE_CACHE_DIR = Path("data") / "scrape_cache"
+SCRAPE_CACHE_TTL_SECONDS = int(os.getenv("SCRAPE_CACHE_TTL_MINUTES", "60")) * 60
+
+
+def _scrape_log_path(day: str) -> Path:
+    """Monthly scrape ledger holding the given YYYY-MM-DD day"""
+    return SCRAPE_LOG_DIR / f"scrape_log-{day[:7]}.jsonl"
+
+
+def _refill_scrape_tokens(tokens: float, updated_at: float, now: float) -> float:
+    """Tokens in a bucket at `now`, capped at the daily limit"""
+    return min(DAILY_SCRAPE_LIMIT, tokens + (now - updated_at) * SCRAPE_REFILL_PER_SECOND)
+
+
+def _load_scrape_buckets(now: float) -> Dict[str, Tuple[float, float]]:
     """
-    Check if user has exceeded daily scrape limit and update count.
-    Returns True if scraping is allowed, False if limit exceeded.
+    Rebuild every user's bucket by replaying the last day of ledger entries;
+    anything older has fully refilled
     """
-    if is_admin:
-        return True
-    
-    # Ensure data directory exists
-    data_dir = Path("data")
-    data_dir.mkdir(exist_ok=True)
+    since = now - 86400
+    events: Dict[str, List[float]] = {}
+    days = {datetime.fromtimestamp(since).strftime("%Y-%m-%d"), datetime.fromtimestamp(now).strftime("%Y-%m-%d")}
     
-    log_file = data_dir / "scrape_log.json"
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    # Load existing log
-    scrape_log = {}
-    if log_file.exists():
+    for ledger in {_scrape_log_path(day) for day in days}:
         try:
-            with open(log_file, 'r') as f:
-                scrape_log = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            scrape_log = {}
-    
-    # Initialize user data if not exists
-    if username not in scrape_log:
-        scrape_log[username] = {}
-    
-    # Get today's count
-    today_count = scrape_log[username].get(today, 0)
-    
-    # Check limit
-    if today_count >= 5:
-        return False
-    
-    # Increment count
-    scrape_log[username][today] = today_count + 1
-    
-    # Clean old entries (keep only last 30 days)
-    current_date = datetime.now()
-    for user in scrape_log:
-        dates_to_remove = []
-        for date_str in scrape_log[user]:
+            with open(ledger, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get('t', 0) >= since:
+                        events.setdefault(entry['u'], []).append(entry['t'])
+        except OSError:
+            continue
+    
+    buckets = {}
+    for username, times in events.items():
+        tokens, updated_at = float(DAILY_SCRAPE_LIMIT), since
+        for t in sorted(times):
+            tokens = max(_refill_scrape_tokens(tokens, updated_at, t) - 1, 0.0)
+            updated_at = t
+        buckets[username] = (tokens, updated_at)
+    return buckets
+
+
+def _purge_scrape_logs():
+    """Drop monthly ledgers outside the retention window"""
+    # Keep roughly the last 30 days: this month's ledger and the previous one
+    oldest_kept = (datetime.now() - timedelta(days=SCRAPE_LOG_RETENTION_DAYS)).strftime("%Y-%m")
+    for ledger in SCRAPE_LOG_DIR.glob("scrape_log-*.jsonl"):
+        if ledger.stem[len("scrape_log-"):] < oldest_kept:
             try:
-                log_date = datetime.strptime(date_str, "%Y-%m-%d")
-                if (current_date - log_date).days > 30:
-                    dates_to_remove.append(date_str)
-            except ValueError:
-                dates_to_remove.append(date_str)
+                ledger.unlink()
+            except OSError:
+                pass
+
+
+def reserve_scrape_token(username: str, is_admin: bool = False) -> Tuple[bool, int]:
+    """
+    Take one scrape token from the user's bucket, pending commit or release.
+    Returns (allowed, retry_after_seconds).
+    """
+    global _scrape_buckets_loaded, _scrape_log_purged_day
+    
+    if is_admin:
+        return True, 0
+    
+    now = time.time()
+    today = datetime.fromtimestamp(now).strftime("%Y-%m-%d")
+    
+    with _scrape_buckets_lock:
+        if not _scrape_buckets_loaded:
+            _scrape_buckets.update(_load_scrape_buckets(now))
+            _scrape_buckets_loaded = True
+        
+        if _scrape_log_purged_day != today:
+            _purge_scrape_logs()
+            _scrape_log_purged_day = today
+        
+        tokens, updated_at = _scrape_buckets.get(username, (float(DAILY_SCRAPE_LIMIT), now))
+        tokens = _refill_scrape_tokens(tokens, updated_at, now)
+        
+        # Check limit
+        if tokens < 1:
+            _scrape_buckets[username] = (tokens, now)
+            return False, math.ceil((1 - tokens) / SCRAPE_REFILL_PER_SECOND)
         
-        for date_str in dates_to_remove:
-            del scrape_log[user][date_str]
+        _scrape_buckets[username] = (tokens - 1, now)
+    
+    return True, 0
+
+
+def commit_scrape_token(username: str, is_admin: bool = False):
+    """Record a reserved token as spent in the ledger"""
+    if is_admin:
+        return
     
-    # Save updated log
+    now = time.time()
+    today = datetime.fromtimestamp(now).strftime("%Y-%m-%d")
+    
+    # Record the scrape as one appended line
     try:
-        with open(log_file, 'w') as f:
-            json.dump(scrape_log, f, indent=2)
+        SCRAPE_LOG_DIR.mkdir(exist_ok=True)
+        with _scrape_buckets_lock, open(_scrape_log_path(today), 'ab') as f:
+            f.write(orjson.dumps({"u": username, "d": today, "t": now}) + b"\n")
     except IOError as e:
         st.warning(f"Could not save scrape log: {e}")
+
+
+def release_scrape_token(username: str, is_admin: bool = False):
+    """Return a reserved token to the user's bucket without recording a scrape"""
+    if is_admin:
+        return
+    
+    now = time.time()
+    with _scrape_buckets_lock:
+        tokens, updated_at = _scrape_buckets.get(username, (float(DAILY_SCRAPE_LIMIT), now))
+        _scrape_buckets[username] = (min(DAILY_SCRAPE_LIMIT, _refill_scrape_tokens(tokens, updated_at, now) + 1), now)
+
+
+def _scrape_cache_path(prompt: str, max_items: int) -> Path:
+    """Cache file for a prompt, keyed on the normalised prompt, item count and date"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    key = f"{' '.join(prompt.lower().split())}|{max_items}|{today}"
+    return SCRAPE_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+def load_cached_scrape(prompt: str, max_items: int = DEFAULT_MAX_ITEMS) -> Optional[Tuple[List[Dict], str]]:
+    """
+    Return cached (results, website) for a prompt if scraped within the TTL,
+    otherwise None
+    """
+    if SCRAPE_CACHE_TTL_SECONDS <= 0:
+        return None
+    
+    cache_file = _scrape_cache_path(prompt, max_items)
+    try:
+        if time.time() - cache_file.stat().st_mtime > SCRAPE_CACHE_TTL_SECONDS:
+            return None
+        cached = orjson.loads(cache_file.read_bytes())
+        return cached['results'], cached['website']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def store_cached_scrape(prompt: str, results: List[Dict], website: str, max_items: int = DEFAULT_MAX_ITEMS):
+    """Write a scrape result to the cache, replacing any previous entry atomically"""
+    if SCRAPE_CACHE_TTL_SECONDS <= 0:
+        return
     
-    return True
+    cache_file = _scrape_cache_path(prompt, max_items)
+    try:
+        SCRAPE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=SCRAPE_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps({'results': results, 'website': website}, default=str))
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        # Caching is best effort; the scrape itself already succeeded
+        pass
+
+
+@st.cache_resource
+def get_backend_session() -> requests.Session:
+    """Shared HTTP session so backend calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    retries = Retry(
+        total=2,
+        read=False,  # a timed-out scrape may still be running; never resend it
+        backoff_factor=0.25,
+        status_forcelist=BACKEND_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=BACKEND_POOL_CONNECTIONS,
+        pool_maxsize=BACKEND_POOL_MAXSIZE,
+        max_retries=retries
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
 
 
 def check_backend_health() -> bool:
-    """Check if the FastAPI backend is running and healthy"""
+    """
+    Check if the FastAPI backend is running and healthy.
+    A success is trusted for BACKEND_HEALTH_TTL_SECONDS per session.
+    """
+    healthy_at = st.session_state.get('backend_healthy_at')
+    if healthy_at is not None and time.monotonic() - healthy_at < BACKEND_HEALTH_TTL_SECONDS:
+        return True
+    
     try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
-        return response.status_code == 200
+        response = get_backend_session().get(f"{BACKEND_URL}/health", timeout=(2, 5))
+        healthy = response.status_code == 200
     except requests.RequestException:
-        return False
+        healthy = False
+    
+    if healthy:
+        st.session_state.backend_healthy_at = time.monotonic()
+    else:
+        invalidate_backend_health()
+    return healthy
+
+
+def invalidate_backend_health():
+    """Force the next check_backend_health call to probe the backend again"""
+    st.session_state.pop('backend_healthy_at', None)
+
+
+def response_preview(response, limit: int = 200) -> str:
+    """First `limit` bytes of a response body, decoded without decoding the rest"""
+    return response.content[:limit].decode('utf-8', 'replace')
 
 
 def safe_json_parse(response):
     """Safely parse JSON response with fallback error handling"""
     try:
-        return response.json()
-    except ValueError as e:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
         # Response is not valid JSON - likely HTML error page
         st.error(f"🔧 Backend returned invalid response format. Status: {response.status_code}")
-        st.error(f"Response preview: {response.text[:200]}...")
+        st.error(f"Response preview: {response_preview(response)}...")
         return {
             "success": False,
             "message": f"Invalid JSON response from backend (Status: {response.status_code})",
@@ -113,11 +325,12 @@ def scrape_data(prompt: str) -> Tuple[List[Dict], str]:
     """
     
     # Input validation
-    if not prompt or not prompt.strip():
+    prompt = prompt.strip() if prompt else ""
+    if not prompt:
         st.error("❌ Please enter a valid scraping request.")
         return [], 'invalid_input'
     
-    if len(prompt.strip()) < 5:
+    if len(prompt) < 5:
         st.error("❌ Scraping request is too short. Please be more specific.")
         return [], 'invalid_input'
     
@@ -133,40 +346,54 @@ def scrape_data(prompt: str) -> Tuple[List[Dict], str]:
         st.error("❌ Invalid user session.")
         return [], 'auth_error'
     
-    # Check scrape limit BEFORE attempting to scrape
-    if not check_and_update_scrape_limit(username, is_admin):
-        st.error("🚫 Daily scrape limit (5) exceeded. Try again tomorrow or contact admin for upgrade.")
-        return [], 'limit_exceeded'
+    # Serve repeat prompts from the cache without spending the daily quota
+    cached = load_cached_scrape(prompt)
+    if cached is not None:
+        results, website = cached
+        st.success(f"✅ Loaded {len(results)} cached records from {website}")
+        return results, website
     
-    # Check if backend is healthy
+    # Check if backend is healthy before spending a scrape token on it
     if not check_backend_health():
         st.error("🔌 Scraping service is currently unavailable. Please try again later.")
         st.info("💡 Tip: If you're running locally, make sure your FastAPI server is running on port 8000")
         return [], 'service_unavailable'
     
+    # Check scrape limit BEFORE attempting to scrape
+    allowed, retry_after = reserve_scrape_token(username, is_admin)
+    if not allowed:
+        hours, minutes = divmod(math.ceil(retry_after / 60), 60)
+        st.error(
+            f"🚫 Scrape limit ({DAILY_SCRAPE_LIMIT} per day) reached. Next scrape available in "
+            f"{hours}h {minutes}m, or contact admin for upgrade."
+        )
+        return [], 'limit_exceeded'
+    
+    # The reserved token is spent once the backend has accepted the request;
+    # it is returned on connection failures and server error responses
+    charged = False
     try:
         # Prepare request payload - match exactly what tester.py sends
         payload = {
-            "prompt": prompt.strip(),
-            "max_items": 50  # Default max items
+            "prompt": prompt,
+            "max_items": DEFAULT_MAX_ITEMS
         }
         
         # Debug log
-        st.info(f"🔄 Sending request to: {BACKEND_URL}/scrape")
+        if SCRAPER_DEBUG:
+            st.info(f"🔄 Sending request to: {BACKEND_URL}/scrape")
         
         # Make request to FastAPI backend
-        response = requests.post(
+        response = get_backend_session().post(
             f"{BACKEND_URL}/scrape",
             json=payload,
-            timeout=120,  # 2 minutes timeout for scraping
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
+            timeout=120  # 2 minutes timeout for scraping
         )
+        charged = response.status_code < UNCHARGED_STATUS_FLOOR
         
         # Debug response
-        st.info(f"📡 Response status: {response.status_code}")
+        if SCRAPER_DEBUG:
+            st.info(f"📡 Response status: {response.status_code}")
         
         # Parse response safely
         if response.status_code == 200:
@@ -184,12 +411,13 @@ def scrape_data(prompt: str) -> Tuple[List[Dict], str]:
                     return [], 'format_error'
                 
                 # Filter out any error entries
-                valid_results = []
-                for result in results:
-                    if isinstance(result, dict) and 'error' not in result:
-                        valid_results.append(result)
+                valid_results = [
+                    result for result in results
+                    if isinstance(result, dict) and 'error' not in result
+                ]
                 
                 if valid_results:
+                    store_cached_scrape(prompt, valid_results, website)
                     st.success(f"✅ {message}")
                     st.info(f"📊 Found {len(valid_results)} records from {website}")
                     return valid_results, website
@@ -229,6 +457,7 @@ def scrape_data(prompt: str) -> Tuple[List[Dict], str]:
         
         elif response.status_code == 500:
             # Internal server error
+            invalidate_backend_health()
             try:
                 error_data = safe_json_parse(response)
                 error_detail = error_data.get("detail", "Internal server error")
@@ -242,15 +471,20 @@ def scrape_data(prompt: str) -> Tuple[List[Dict], str]:
         else:
             # Other HTTP errors
             st.error(f"❌ Request failed with status code: {response.status_code}")
-            st.error(f"Response: {response.text[:200]}")
+            st.error(f"Response: {response_preview(response)}")
             return [], 'http_error'
     
-    except requests.Timeout:
+    except requests.Timeout as e:
+        # The backend accepted the scrape and may still be running it, so the
+        # token is spent; a connect timeout never reached the backend
+        charged = not isinstance(e, requests.ConnectTimeout)
+        invalidate_backend_health()
         st.error("⏱️ Request timed out. The website might be taking too long to respond.")
         st.info("💡 Try again with a simpler request or fewer items.")
         return [], 'timeout'
     
     except requests.ConnectionError:
+        invalidate_backend_health()
         st.error("🔌 Could not connect to scraping service.")
         st.info("💡 Please check:")
         st.info("   • Your internet connection")
@@ -266,6 +500,12 @@ def scrape_data(prompt: str) -> Tuple[List[Dict], str]:
         st.error(f"❌ Unexpected error: {str(e)}")
         st.info("💡 Please try again or contact support if the issue persists.")
         return [], 'unexpected_error'
+    
+    finally:
+        if charged:
+            commit_scrape_token(username, is_admin)
+        else:
+            release_scrape_token(username, is_admin)
 
 
 def get_scraping_status_message(status_code: str) -> str:
@@ -297,28 +537,22 @@ def validate_scraping_prompt(prompt: str) -> Tuple[bool, str]:
     Validate if the scraping prompt is reasonable
     Returns (is_valid, error_message)
     """
-    if not prompt or not prompt.strip():
+    stripped = prompt.strip() if prompt else ""
+    if not stripped:
         return False, "Prompt cannot be empty"
     
     # Check minimum length
-    if len(prompt.strip()) < 10:
+    if len(stripped) < 10:
         return False, "Prompt is too short. Please provide more details."
     
     # Check maximum length
-    if len(prompt.strip()) > 500:
+    if len(stripped) > 500:
         return False, "Prompt is too long. Please keep it under 500 characters."
     
     # Check for potentially harmful requests
-    harmful_keywords = [
-        'hack', 'attack', 'exploit', 'password', 'credential',
-        'private', 'personal', 'confidential', 'bank', 'payment',
-        'login', 'admin', 'root', 'database'
-    ]
-    
-    prompt_lower = prompt.lower()
-    for keyword in harmful_keywords:
-        if keyword in prompt_lower:
-            return False, f"Request contains potentially harmful keyword: '{keyword}'"
+    match = HARMFUL_KEYWORD_PATTERN.search(prompt)
+    if match:
+        return False, f"Request contains potentially harmful keyword: '{match.group(1).lower()}'"
     
     return True, ""
 
@@ -333,12 +567,11 @@ def estimate_scraping_time(prompt: str) -> int:
     base_time = 10
     
     # Add time based on complexity
-    if any(site in prompt_lower for site in ['flipkart', 'amazon']):
+    if any(site in prompt_lower for site in SLOW_SITE_KEYWORDS):
         base_time += 20
     
     # Add time based on number of items
-    import re
-    number_match = re.search(r'\b(\d+)\b', prompt)
+    number_match = ITEM_COUNT_PATTERN.search(prompt)
     if number_match:
         num_items = int(number_match.group(1))
         base_time += min(num_items // 10, 30)  # Cap at 30 extra seconds
@@ -1,11 +1,8 @@
 import streamlit as st
 
-def hide_streamlit_sidebar():
-    """
-    Completely hide Streamlit's default sidebar and navigation elements
-    This prevents the sidebar flash and removes all traces of the default navigation
-    """
-    st.markdown("""
+# Stylesheets are built once at import; Streamlit clears the page on every
+# rerun, so apply_page_styling still has to emit them each time
+SIDEBAR_CSS = """
         <style>
         /* Hide the entire sidebar */
         [data-testid="stSidebar"] {
@@ -49,13 +46,9 @@ def hide_streamlit_sidebar():
         footer {visibility: hidden;}
         header {visibility: hidden;}
         </style>
-    """, unsafe_allow_html=True)
-
-def apply_custom_styling():
     """
-    Apply custom styling for the app
-    """
-    st.markdown("""
+
+APP_CSS = """
         <style>
         /* Custom app styling */
         .stApp {
@@ -83,4 +76,89 @@ def apply_custom_styling():
             box-shadow: 0 4px 15px rgba(0,0,0,0.2);
         }
         </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """
+
+# Header bar and navigation pills used by the dashboard
+DASHBOARD_CSS = """
+<style>
+    /* Top header bar with logout button */
+    .header-bar {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        padding: 1rem 2rem;
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    }
+    
+    .header-title {
+        font-size: 1.5rem;
+        font-weight: bold;
+        margin: 0;
+    }
+    
+    .logout-btn {
+        background: rgba(255,255,255,0.2);
+        border: 1px solid rgba(255,255,255,0.3);
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        color: white;
+        text-decoration: none;
+        transition: all 0.3s ease;
+        cursor: pointer;
+        font-weight: 500;
+    }
+    
+    .logout-btn:hover {
+        background: rgba(255,255,255,0.3);
+        transform: translateY(-2px);
+        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+    }
+    
+    /* Navigation pills */
+    .nav-pills {
+        display: flex;
+        gap: 1rem;
+        margin-bottom: 2rem;
+        background: #f8f9fa;
+        padding: 1rem;
+        border-radius: 10px;
+    }
+    
+    .nav-pill {
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        border: none;
+        background: white;
+        color: #666;
+        cursor: pointer;
+        transition: all 0.3s ease;
+        text-decoration: none;
+    }
+    
+    .nav-pill.active {
+        background: #667eea;
+        color: white;
+    }
+    
+    .nav-pill:hover {
+        background: #667eea;
+        color: white;
+        transform: translateY(-2px);
+    }
+</style>
+"""
+
+# Combined stylesheets so a page injects all of its CSS as one element
+PAGE_CSS = SIDEBAR_CSS + APP_CSS
+DASHBOARD_PAGE_CSS = PAGE_CSS + DASHBOARD_CSS
+
+def apply_page_styling(dashboard=False):
+    """
+    Hide the sidebar and apply the app styling (plus the dashboard styling
+    if requested) with a single markdown element
+    """
+    st.markdown(DASHBOARD_PAGE_CSS if dashboard else PAGE_CSS, unsafe_allow_html=True)